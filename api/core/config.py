@@ -1,10 +1,11 @@
 """
 Configuration settings for Teddy AI Service
 """
+from functools import lru_cache
 from typing import List, Optional, Union
 from pydantic import field_validator
-from pydantic_settings import BaseSettings
-import json
+from pydantic_settings import BaseSettings, SettingsConfigDict
+import orjson
 
 
 class Settings(BaseSettings):
@@ -19,21 +20,19 @@ class Settings(BaseSettings):
     @field_validator("BACKEND_CORS_ORIGINS", mode="before")
     @classmethod
     def assemble_cors_origins(cls, v: Union[str, List[str]]) -> List[str]:
-        if isinstance(v, str):
-            if v.startswith("[") and v.endswith("]"):
-                # Handle JSON array format
-                import json
-                try:
-                    return json.loads(v)
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, fall back to comma-separated
-                    return [i.strip() for i in v.split(",")]
-            else:
-                # Handle comma-separated format
-                return [i.strip() for i in v.split(",") if i.strip()]
-        elif isinstance(v, list):
+        if isinstance(v, list):
             return v
-        return []
+        if not isinstance(v, str):
+            return []
+        if v[:1] == "[":
+            # Handle JSON array format
+            try:
+                return orjson.loads(v)
+            except orjson.JSONDecodeError:
+                # If JSON parsing fails, fall back to comma-separated
+                return [i.strip() for i in v.split(",")]
+        # Handle comma-separated format
+        return [s for s in (p.strip() for p in v.split(",")) if s]
 
     # Security
     SECRET_KEY: str
@@ -46,6 +45,9 @@ class Settings(BaseSettings):
     LLM_MODEL: str = "gpt-3.5-turbo"
     MAX_TOKENS: int = 4000
     TEMPERATURE: float = 0.7
+    # Minimum populated data sources before property insights pay for an LLM
+    # call; sparser properties fall back to rule-based analysis
+    LLM_MIN_SIGNALS: int = 3
     
     # OpenAI Configuration
     OPENAI_API_KEY: Optional[str] = None
@@ -79,6 +81,10 @@ class Settings(BaseSettings):
     DATABASE_SCHEMA: Optional[str] = None  # PostgreSQL schema name (e.g., 'teddy_ai')
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 40
+    # Auto-create tables at startup (dev convenience); disable in production
+    # where migrations own the schema - create_all introspects every table
+    # on each process start
+    AUTO_CREATE_TABLES: bool = True
 
     # Snowflake Configuration
     SNOWFLAKE_ACCOUNT: str
@@ -89,6 +95,9 @@ class Settings(BaseSettings):
     SNOWFLAKE_SCHEMA: str = "CURATED"
     SNOWFLAKE_WAREHOUSE: str = "BIRDDOG_WH"
     SNOWFLAKE_ROLE: str = "DATAENGINEERINGADMIN"
+    # Max idle connections kept by the connector's pool; each fresh connect
+    # costs a TLS handshake plus auth round trip
+    SNOWFLAKE_POOL_SIZE: int = 8
 
     # Redis Configuration
     REDIS_URL: Optional[str] = None
@@ -116,9 +125,28 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "json"
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = True
+    # frozen=True lets Pydantic treat the instance as immutable, enabling
+    # cheaper attribute access on hot paths and making it hashable
+    model_config = SettingsConfigDict(
+        env_file=".env",
+        case_sensitive=True,
+        frozen=True,
+        extra="ignore",
+    )
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build the Settings instance once, on first use"""
+    return Settings()
+
+
+class _LazySettings:
+    """Proxy that defers Settings() construction (env parsing, validation)
+    until the first attribute access, keeping module import cheap"""
+
+    def __getattr__(self, name: str):
+        return getattr(get_settings(), name)
+
+
+settings = _LazySettings()
@@ -1,28 +1,43 @@
 """
 Common dependencies for the API
 """
-from typing import Generator, Optional
+import asyncio
+import queue
+from contextlib import contextmanager
+from typing import AsyncGenerator, Generator, Optional
+
+import orjson
 from fastapi import Depends, HTTPException, status
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
-import redis
+import redis.asyncio as redis
 from snowflake.connector import connect as snowflake_connect
 from snowflake.connector.connection import SnowflakeConnection
 
 from api.core.config import settings
 
+# orjson-backed (de)serialization for JSON/JSONB column binds - meta_data
+# payloads (RAG sources etc.) can be large, and stdlib json is the slowest
+# part of writing them; default=str covers Decimals from Snowflake
+def _json_serializer(obj) -> str:
+    return orjson.dumps(obj, default=str).decode()
+
+
 # Database Setup - Handle different database types
 def create_database_engine():
     """Create database engine with appropriate parameters based on database type"""
     database_url = settings.DATABASE_URL
-    
+
     # Check if it's SQLite
     if database_url.startswith('sqlite'):
         # SQLite doesn't support pool_size and max_overflow
         return create_engine(
             database_url,
             pool_pre_ping=True,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
     else:
         # PostgreSQL and other databases
@@ -31,24 +46,51 @@ def create_database_engine():
             pool_size=settings.DATABASE_POOL_SIZE,
             max_overflow=settings.DATABASE_MAX_OVERFLOW,
             pool_pre_ping=True,
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
         )
 
 engine = create_database_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine (asyncpg) for endpoints whose DB waits should overlap other
+# I/O instead of blocking the event loop; Postgres-only
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_URL.startswith('postgresql'):
+    async_engine = create_async_engine(
+        settings.DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://', 1),
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_pre_ping=True,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
+    )
+    AsyncSessionLocal = sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+    )
+
 # Configure schema for all models if specified
 if settings.DATABASE_SCHEMA:
     Base.metadata.schema = settings.DATABASE_SCHEMA
 
-# Redis Setup - Handle disabled Redis gracefully
+# Redis Setup - Handle disabled Redis gracefully. One explicit connection
+# pool is shared by every client use in the process; the async client
+# connects lazily, so failures surface per-command where they are caught.
+redis_pool = None
 redis_client = None
 if settings.REDIS_URL and settings.REDIS_URL.strip():
     try:
-        redis_client = redis.from_url(settings.REDIS_URL, decode_responses=True)
-        # Test connection
-        redis_client.ping()
+        redis_pool = redis.ConnectionPool.from_url(
+            settings.REDIS_URL,
+            decode_responses=True,
+            max_connections=64,
+            health_check_interval=30,
+        )
+        redis_client = redis.Redis(connection_pool=redis_pool)
     except (redis.RedisError, Exception):
+        redis_pool = None
         redis_client = None
 
 
@@ -61,57 +103,159 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def get_redis() -> Optional[redis.Redis]:
+@contextmanager
+def db_session() -> Generator[Session, None, None]:
+    """Session as a context manager, for code outside dependency injection.
+
+    Lets handlers that only hit the database on some branches open the
+    session where it is actually used instead of per-request via Depends.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+class _SyncSessionAdapter:
+    """Async facade over a sync Session, for non-Postgres URLs (sqlite).
+
+    Presents the subset of the AsyncSession API the endpoints use, running
+    each round trip in a worker thread so the event loop stays free. The
+    underlying session connects lazily, so handlers that never touch the
+    database (demo mode) pay nothing.
+    """
+
+    def __init__(self, db: Session):
+        self._db = db
+
+    async def execute(self, *args, **kwargs):
+        return await asyncio.to_thread(self._db.execute, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await asyncio.to_thread(self._db.commit)
+
+    def add(self, instance) -> None:
+        self._db.add(instance)
+
+    def add_all(self, instances) -> None:
+        self._db.add_all(instances)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """Get async database session (threadpool-backed on non-Postgres URLs)"""
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+    else:
+        db = SessionLocal()
+        try:
+            yield _SyncSessionAdapter(db)
+        finally:
+            db.close()
+
+
+async def get_redis() -> Optional[redis.Redis]:
     """Get Redis client (returns None if Redis is disabled)"""
     return redis_client
 
 
+# Pool of idle Snowflake connections shared across requests - each fresh
+# connect costs a TLS handshake plus auth round trip (hundreds of ms)
+_SF_POOL_SIZE = 5
+_sf_pool: queue.Queue = queue.Queue(maxsize=_SF_POOL_SIZE)
+
+
+def _create_snowflake_connection() -> SnowflakeConnection:
+    """Open a new Snowflake connection"""
+    return snowflake_connect(
+        account=settings.SNOWFLAKE_ACCOUNT,
+        user=settings.SNOWFLAKE_USER,
+        password=settings.SNOWFLAKE_PASSWORD,
+        database=settings.SNOWFLAKE_DATABASE,
+        schema=settings.SNOWFLAKE_SCHEMA,
+        warehouse=settings.SNOWFLAKE_WAREHOUSE,
+        role=settings.SNOWFLAKE_ROLE,
+    )
+
+
 def get_snowflake_connection() -> Generator[SnowflakeConnection, None, None]:
-    """Get Snowflake connection"""
+    """Get Snowflake connection from the process-wide pool"""
     conn = None
     try:
-        conn = snowflake_connect(
-            account=settings.SNOWFLAKE_ACCOUNT,
-            user=settings.SNOWFLAKE_USER,
-            password=settings.SNOWFLAKE_PASSWORD,
-            database=settings.SNOWFLAKE_DATABASE,
-            schema=settings.SNOWFLAKE_SCHEMA,
-            warehouse=settings.SNOWFLAKE_WAREHOUSE,
-            role=settings.SNOWFLAKE_ROLE,
-        )
+        try:
+            conn = _sf_pool.get_nowait()
+            if conn.is_closed():
+                conn = _create_snowflake_connection()
+        except queue.Empty:
+            conn = _create_snowflake_connection()
         yield conn
+        # Healthy connection - return it to the pool for the next request
+        try:
+            _sf_pool.put_nowait(conn)
+            conn = None
+        except queue.Full:
+            pass
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=f"Could not connect to Snowflake: {str(e)}"
         )
     finally:
+        # Only reached with a live connection when it was not pooled
+        # (pool full) or the request failed - discard it either way
         if conn:
             conn.close()
 
 
+# Snapshot settings read on every request into plain module-level constants to
+# avoid Pydantic attribute-access overhead on the rate-limit/cache hot path
+_RATE_LIMIT_REQUESTS = settings.RATE_LIMIT_REQUESTS
+_RATE_LIMIT_PERIOD = settings.RATE_LIMIT_PERIOD
+_CACHE_TTL = settings.REDIS_CACHE_TTL
+
+
+def refresh_settings() -> None:
+    """Rebind the cached settings snapshot (e.g. after config reload)"""
+    global _RATE_LIMIT_REQUESTS, _RATE_LIMIT_PERIOD, _CACHE_TTL
+    _RATE_LIMIT_REQUESTS = settings.RATE_LIMIT_REQUESTS
+    _RATE_LIMIT_PERIOD = settings.RATE_LIMIT_PERIOD
+    _CACHE_TTL = settings.REDIS_CACHE_TTL
+
+
+# Lua script so the INCR + conditional EXPIRE happen in a single atomic
+# round trip instead of two network calls per request
+_RATE_LIMIT_LUA = """
+local current = redis.call('INCR', KEYS[1])
+if current == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return current
+"""
+
+
 class RateLimiter:
     """Rate limiting dependency"""
-    
-    def __init__(self, requests: int = settings.RATE_LIMIT_REQUESTS, 
-                 period: int = settings.RATE_LIMIT_PERIOD):
+
+    def __init__(self, requests: int = _RATE_LIMIT_REQUESTS,
+                 period: int = _RATE_LIMIT_PERIOD):
         self.requests = requests
         self.period = period
         self.redis = redis_client
-    
+        # register_script caches the SHA1 and falls back to EVAL on NOSCRIPT
+        self._script = redis_client.register_script(_RATE_LIMIT_LUA) if redis_client else None
+
     async def __call__(self, user_id: str) -> bool:
         """Check if user has exceeded rate limit"""
         # If Redis is disabled, skip rate limiting
         if not self.redis:
             return True
-            
+
         key = f"rate_limit:{user_id}"
-        
+
         try:
-            current = self.redis.incr(key)
-            if current == 1:
-                self.redis.expire(key, self.period)
-            
+            current = await self._script(keys=[key], args=[self.period])
+
             if current > self.requests:
                 raise HTTPException(
                     status_code=status.HTTP_429_TOO_MANY_REQUESTS,
@@ -133,14 +277,14 @@ class Cache:
     
     def __init__(self, redis_client: Optional[redis.Redis] = redis_client):
         self.redis = redis_client
-        self.default_ttl = settings.REDIS_CACHE_TTL
+        self.default_ttl = _CACHE_TTL
     
     async def get(self, key: str) -> Optional[str]:
         """Get value from cache"""
         if not self.redis:
             return None
         try:
-            return self.redis.get(key)
+            return await self.redis.get(key)
         except redis.RedisError:
             return None
     
@@ -150,7 +294,7 @@ class Cache:
             return False
         try:
             ttl = ttl or self.default_ttl
-            return self.redis.setex(key, ttl, value)
+            return await self.redis.setex(key, ttl, value)
         except redis.RedisError:
             return False
     
@@ -159,16 +303,23 @@ class Cache:
         if not self.redis:
             return False
         try:
-            return bool(self.redis.delete(key))
+            return bool(await self.redis.delete(key))
         except redis.RedisError:
             return False
     
+    def pipeline(self):
+        """Pipeline for batching independent commands into one round trip
+        (returns None if Redis is disabled)"""
+        if not self.redis:
+            return None
+        return self.redis.pipeline(transaction=False)
+
     async def exists(self, key: str) -> bool:
         """Check if key exists in cache"""
         if not self.redis:
             return False
         try:
-            return bool(self.redis.exists(key))
+            return bool(await self.redis.exists(key))
         except redis.RedisError:
             return False
 
@@ -177,23 +328,30 @@ class Cache:
 cache = Cache()
 
 
-def get_optional_current_user():
-    """
-    Optional authentication dependency that returns user if authentication is enabled,
-    otherwise returns mock demo user for development/demo mode
+def _demo_user():
+    """Mock user injected when authentication is disabled (development/demo)"""
+    return {
+        "id": "demo-user",
+        "email": "demo@example.com",
+        "role": "user",
+        "is_active": True
+    }
+
+
+def __getattr__(name):
+    """Resolve get_optional_current_user to its final callable on first access.
+
+    Done lazily (PEP 562) because importing api.core.security at module scope
+    would create an import cycle (security imports get_db from here). Binding
+    the resolved callable into module globals keeps its identity stable, so
+    FastAPI caches the dependency instead of re-branching per request.
     """
-    from api.core.security import get_current_user
-    
-    if settings.ENABLE_AUTHENTICATION:
-        # Return the actual dependency function for authentication
-        return get_current_user
-    else:
-        # Return a function that provides mock demo user
-        def demo_user():
-            return {
-                "id": "demo-user",
-                "email": "demo@example.com",
-                "role": "user",
-                "is_active": True
-            }
-        return demo_user
+    if name == "get_optional_current_user":
+        if settings.ENABLE_AUTHENTICATION:
+            from api.core.security import get_current_user
+            resolved = get_current_user
+        else:
+            resolved = _demo_user
+        globals()["get_optional_current_user"] = resolved
+        return resolved
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
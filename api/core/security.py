@@ -1,13 +1,13 @@
 """
 Security utilities for authentication and authorization
 """
-from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from api.core.config import settings
 from api.core.dependencies import get_db
@@ -16,6 +16,18 @@ from api.models.database import User
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/auth/login")
 
+# Snapshot settings used on every request into module-level constants so the
+# hot token paths avoid Pydantic attribute-access overhead per call
+_SECRET_KEY = settings.SECRET_KEY
+_ALGORITHM = settings.ALGORITHM
+
+
+def refresh_settings() -> None:
+    """Rebind the cached settings snapshot (e.g. after rotating secrets)"""
+    global _SECRET_KEY, _ALGORITHM
+    _SECRET_KEY = settings.SECRET_KEY
+    _ALGORITHM = settings.ALGORITHM
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -27,22 +39,10 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    """Create JWT access token"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
-
-
 def decode_token(token: str) -> dict:
     """Decode JWT token"""
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _SECRET_KEY, algorithms=[_ALGORITHM])
         return payload
     except JWTError:
         raise HTTPException(
@@ -71,10 +71,16 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Preferences ride along with the auth fetch so endpoints that need them
+    # (recommendations, chat personalization) don't issue a second query
+    user = db.execute(
+        select(User)
+        .options(selectinload(User.preferences))
+        .where(User.id == user_id)
+    ).scalar_one_or_none()
     if user is None:
         raise credentials_exception
-    
+
     return user
 
 
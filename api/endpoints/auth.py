@@ -1,12 +1,16 @@
 """
 Authentication endpoints
 """
-from datetime import datetime, timedelta
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+import logging
+import time
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session
-from jose import JWTError, jwt
+import jwt as pyjwt
 
 from api.core.config import settings
 from api.core.dependencies import get_db
@@ -14,90 +18,136 @@ from api.core.security import verify_password, get_password_hash, get_current_ac
 from api.models import database as models
 from api.models import schemas
 
+logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Precompiled lookup statement so register/login reuse one cached query plan
+# instead of rebuilding the ORM query on every request
+_USER_BY_EMAIL = (
+    select(models.User)
+    .where(models.User.email == bindparam("email"))
+    .limit(1)
+)
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
+# Hash verified against when the email does not exist, so failed logins do
+# the same bcrypt work (and take the same time) as real password checks
+_DUMMY_PASSWORD_HASH = get_password_hash("x" * 12)
+
+# Token lifetime in seconds, computed once - JWT exp is a Unix timestamp, so
+# the hot path can use time.time() without any datetime/timedelta allocations
+_ACCESS_TTL_SECONDS = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+# Pre-resolve the signing key and algorithm once; PyJWT's HS256 encode path
+# is leaner than python-jose, which re-parses the key string per call
+_SECRET_KEY_BYTES = settings.SECRET_KEY.encode()
+_ALGORITHM = settings.ALGORITHM
+
+
+def create_access_token(sub: str, user_id: str, expires_seconds: int = _ACCESS_TTL_SECONDS):
     """Create JWT access token"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    return pyjwt.encode(
+        {"sub": sub, "user_id": user_id, "exp": int(time.time()) + expires_seconds},
+        _SECRET_KEY_BYTES,
+        algorithm=_ALGORITHM
+    )
 
 
 @router.post("/register", response_model=schemas.UserResponse)
-def register(
+async def register(
     user_data: schemas.UserCreate,
     db: Session = Depends(get_db)
 ):
     """Register a new user"""
     try:
-        # Check if user already exists
-        existing_user = db.query(models.User).filter(
-            models.User.email == user_data.email
-        ).first()
-        
-        if existing_user:
+        # bcrypt takes 50-200ms; run it in the threadpool so the event loop
+        # keeps serving other requests meanwhile
+        hashed_password = await run_in_threadpool(get_password_hash, user_data.password)
+
+        # Single INSERT round trip: the email-uniqueness check rides on the
+        # conflict clause and the created row comes back via RETURNING, so no
+        # separate existence SELECT or post-commit refresh is needed
+        stmt = (
+            pg_insert(models.User)
+            .values(
+                email=user_data.email,
+                hashed_password=hashed_password,
+                first_name=user_data.first_name,
+                last_name=user_data.last_name,
+                role=user_data.role.value if hasattr(user_data.role, 'value') else user_data.role,  # Handle enum
+                is_active=True
+            )
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(models.User)
+        )
+
+        # The session is sync, so the insert+commit round trips run in the
+        # threadpool too - otherwise they would block the event loop that
+        # the async handler is supposed to keep free
+        def _insert_user():
+            row = db.execute(stmt).first()
+            db.commit()
+            return row
+
+        db_user = await run_in_threadpool(_insert_user)
+
+        if db_user is None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
-        
-        # Create new user
-        db_user = models.User(
-            email=user_data.email,
-            hashed_password=get_password_hash(user_data.password),
-            first_name=user_data.first_name,
-            last_name=user_data.last_name,
-            role=user_data.role.value if hasattr(user_data.role, 'value') else user_data.role,  # Handle enum
-            is_active=True
-        )
-        
-        db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
-        
-        return schemas.UserResponse(
-            id=str(db_user.id),
-            email=db_user.email,
-            first_name=db_user.first_name,
-            last_name=db_user.last_name,
-            role=db_user.role,
-            is_active=db_user.is_active,
-            created_at=db_user.created_at
-        )
-    except Exception as e:
-        import traceback
-        print(f"Registration error: {str(e)}")
-        print(traceback.format_exc())
+
+        return schemas.UserResponse.model_validate(db_user)
+    except HTTPException:
+        raise
+    except SQLAlchemyError:
+        # Other exceptions propagate to the app-level handler, which already
+        # logs them with structure
+        logger.exception("Registration failed")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Registration failed: {str(e)}"
+            detail="Registration failed"
         )
 
 
 @router.post("/login", response_model=schemas.TokenResponse)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """Login and receive access token"""
-    # Authenticate user
-    user = db.query(models.User).filter(
-        models.User.email == form_data.username
-    ).first()
-    
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    # Reject obviously invalid emails before the DB round trip
+    if "@" not in form_data.username or len(form_data.username) > 320:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    
+
+    # Authenticate user; the sync session's round trip goes through the
+    # threadpool so it doesn't block the event loop
+    user = await run_in_threadpool(
+        lambda: db.execute(
+            _USER_BY_EMAIL, {"email": form_data.username}
+        ).scalar_one_or_none()
+    )
+
+    if not user:
+        # Burn an equivalent hash verification so timing does not reveal
+        # whether the email is registered
+        await run_in_threadpool(verify_password, form_data.password, _DUMMY_PASSWORD_HASH)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+    if not await run_in_threadpool(verify_password, form_data.password, user.hashed_password):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
     if not user.is_active:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -105,11 +155,7 @@ def login(
         )
     
     # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email, "user_id": str(user.id)},
-        expires_delta=access_token_expires
-    )
+    access_token = create_access_token(sub=user.email, user_id=str(user.id))
     
     return schemas.TokenResponse(
         access_token=access_token,
@@ -123,11 +169,7 @@ def refresh_token(
     db: Session = Depends(get_db)
 ):
     """Refresh access token"""
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": current_user.email, "user_id": str(current_user.id)},
-        expires_delta=access_token_expires
-    )
+    access_token = create_access_token(sub=current_user.email, user_id=str(current_user.id))
     
     return schemas.TokenResponse(
         access_token=access_token,
@@ -137,15 +179,18 @@ def refresh_token(
 
 @router.get("/me", response_model=schemas.UserResponse)
 def get_current_user_info(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_active_user)
 ):
     """Get current user information"""
-    return schemas.UserResponse(
-        id=str(current_user.id),
-        email=current_user.email,
-        first_name=current_user.first_name,
-        last_name=current_user.last_name,
-        role=current_user.role,
-        is_active=current_user.is_active,
-        created_at=current_user.created_at
-    )
+    # Weak ETag keyed on the user row version - lets clients and proxies skip
+    # re-serializing/re-downloading the body while the profile is unchanged
+    updated = current_user.updated_at or current_user.created_at
+    etag = f'W/"{current_user.id}-{int(updated.timestamp())}"'
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return schemas.UserResponse.model_validate(current_user)
@@ -1,20 +1,36 @@
 """
 Chat endpoint for conversational AI interface
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response, status
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, raiseload, selectinload
 from typing import Optional
+import asyncio
+import time
 import uuid
 import logging
-import json
+from collections import defaultdict
+import orjson
 from decimal import Decimal
 
-from api.core.dependencies import get_db, cache, rate_limiter, get_optional_current_user
+from api.core.dependencies import (
+    AsyncSessionLocal,
+    cache,
+    get_async_db,
+    get_db,
+    get_optional_current_user,
+    rate_limiter,
+    redis_client,
+)
 from api.core.security import get_current_active_user
 from api.models import database as models
 from api.models import schemas
+from data_connectors.snowflake_connector import SnowflakeConnector
 from services.llm_service import LLMService
 from services.embedding_service import EmbeddingService
+from services.semantic_cache import semantic_cache
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -22,6 +38,7 @@ router = APIRouter()
 # Services will be initialized lazily
 _llm_service = None
 _embedding_service = None
+_snowflake_connector = None
 
 def get_llm_service():
     global _llm_service
@@ -35,24 +52,113 @@ def get_embedding_service():
         _embedding_service = EmbeddingService()
     return _embedding_service
 
+def get_snowflake_connector():
+    global _snowflake_connector
+    if _snowflake_connector is None:
+        _snowflake_connector = SnowflakeConnector()
+    return _snowflake_connector
 
-def _convert_decimals_to_float(obj):
-    """Recursively convert Decimal objects to float for JSON serialization"""
+
+async def _none():
+    """Placeholder awaitable for optional branches in asyncio.gather"""
+    return None
+
+
+# Redis-backed conversation history: an append-only list per conversation
+# turns the O(n) Postgres message read on every chat turn into an O(1)
+# LRANGE, with Postgres as the durable store and cold-start source
+_HISTORY_MAX = 50
+_HISTORY_TTL = 86400
+
+
+def _history_key(conversation_id) -> str:
+    return f"conv:{conversation_id}:msgs"
+
+
+async def _push_history(history_key: str, *turns: dict, reset: bool = False) -> None:
+    """Append turns to the Redis history list, trimmed and TTL'd.
+
+    With reset=True the list is replaced wholesale, for callers that hold
+    the authoritative history and can't know what the list already has.
+    """
+    if redis_client is None or not turns:
+        return
+    try:
+        async with redis_client.pipeline(transaction=False) as rpipe:
+            if reset:
+                rpipe.delete(history_key)
+            rpipe.rpush(history_key, *[orjson.dumps(t) for t in turns])
+            rpipe.ltrim(history_key, -_HISTORY_MAX, -1)
+            rpipe.expire(history_key, _HISTORY_TTL)
+            await rpipe.execute()
+    except Exception as e:
+        logger.warning(f"Failed to update history list {history_key}: {e}")
+
+
+async def _persist_turn(
+    conversation_pk,
+    user_content: str,
+    user_meta: dict,
+    ai_response: str,
+    assistant_meta: dict
+) -> None:
+    """Write both turns of an exchange to Postgres.
+
+    Runs as a background task after the response is sent, with its own
+    session - the request-scoped session is already closed by then.
+    """
+    if AsyncSessionLocal is None:
+        return
+    try:
+        async with AsyncSessionLocal() as session:
+            # Writable CTE: both message rows and the conversation-timestamp
+            # bump travel in a single statement / round trip
+            inserted = (
+                insert(models.Message)
+                .values([
+                    {
+                        "conversation_id": conversation_pk,
+                        "role": "user",
+                        "content": user_content,
+                        "meta_data": user_meta,
+                    },
+                    {
+                        "conversation_id": conversation_pk,
+                        "role": "assistant",
+                        "content": ai_response,
+                        "meta_data": assistant_meta,
+                    },
+                ])
+                .returning(models.Message.created_at)
+                .cte("inserted")
+            )
+            await session.execute(
+                update(models.Conversation)
+                .where(models.Conversation.id == conversation_pk)
+                .values(
+                    updated_at=select(func.max(inserted.c.created_at)).scalar_subquery()
+                )
+            )
+            await session.commit()
+    except Exception:
+        logger.exception(f"Failed to persist conversation turn for {conversation_pk}")
+
+
+def _json_default(obj):
+    """orjson default hook - fires only on types orjson can't encode natively"""
     if isinstance(obj, Decimal):
         return float(obj)
-    elif isinstance(obj, dict):
-        return {key: _convert_decimals_to_float(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [_convert_decimals_to_float(item) for item in obj]
-    else:
-        return obj
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 
-@router.post("/message", response_model=schemas.ChatResponse)
+# The 200 model is declared for OpenAPI only; the handler returns an
+# ORJSONResponse directly to skip re-validation and jsonable_encoder
+@router.post("/message", responses={200: {"model": schemas.ChatResponse}})
 async def send_message(
     request: schemas.ChatRequest,
-    current_user = Depends(get_optional_current_user()),
-    db: Session = Depends(get_db)
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_optional_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Send a message to the AI assistant"""
     try:
@@ -67,51 +173,83 @@ async def send_message(
         conversation_history = []
         
         if settings.ENABLE_AUTHENTICATION:
-            # Full database-backed conversation management
+            # Full conversation management: the Redis history list is the hot
+            # source for the LLM context window, Postgres the durable store
             if request.conversation_id:
-                conversation = db.query(models.Conversation).filter(
-                    models.Conversation.id == request.conversation_id,
-                    models.Conversation.user_id == current_user.id
-                ).first()
-                
-                if not conversation:
-                    raise HTTPException(
-                        status_code=status.HTTP_404_NOT_FOUND,
-                        detail="Conversation not found"
-                    )
+                history_key = _history_key(request.conversation_id)
+                raw_history = []
+                if redis_client is not None:
+                    try:
+                        raw_history = await redis_client.lrange(history_key, 0, -1)
+                    except Exception as e:
+                        logger.warning(f"History list read failed: {e}")
+
+                if raw_history:
+                    # Hot path: only validate ownership, no message load
+                    conversation = (await db.execute(
+                        select(models.Conversation)
+                        .options(raiseload("*"))
+                        .where(
+                            models.Conversation.id == request.conversation_id,
+                            models.Conversation.user_id == current_user.id
+                        )
+                    )).scalar_one_or_none()
+
+                    if not conversation:
+                        raise HTTPException(
+                            status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Conversation not found"
+                        )
+                    conversation_pk = conversation.id
+                    conversation_history = [orjson.loads(m) for m in raw_history]
+                else:
+                    # Cold key: rebuild from Postgres and repopulate Redis
+                    conversation = (await db.execute(
+                        select(models.Conversation)
+                        .options(
+                            selectinload(models.Conversation.messages),
+                            raiseload("*")
+                        )
+                        .where(
+                            models.Conversation.id == request.conversation_id,
+                            models.Conversation.user_id == current_user.id
+                        )
+                    )).scalar_one_or_none()
+
+                    if not conversation:
+                        raise HTTPException(
+                            status_code=status.HTTP_404_NOT_FOUND,
+                            detail="Conversation not found"
+                        )
+                    conversation_pk = conversation.id
+                    history_messages = sorted(conversation.messages, key=lambda m: m.created_at)
+                    conversation_history = [
+                        {"role": msg.role, "content": msg.content}
+                        for msg in history_messages
+                    ]
+                    await _push_history(history_key, *conversation_history)
             else:
-                # Create new conversation
-                conversation = models.Conversation(
-                    user_id=current_user.id,
-                    conversation_type=request.conversation_type,
-                    property_id=request.property_id,
-                    meta_data=request.context or {}
-                )
-                db.add(conversation)
-                db.commit()
-                db.refresh(conversation)
-            
-            # Save user message
-            user_message = models.Message(
-                conversation_id=conversation.id,
-                role="user",
-                content=request.message,
-                meta_data=request.context or {}
-            )
-            db.add(user_message)
-            
-            # Get conversation history
-            messages = db.query(models.Message).filter(
-                models.Message.conversation_id == conversation.id
-            ).order_by(models.Message.created_at).all()
-            
-            # Prepare context for LLM
-            conversation_history = [
-                {"role": msg.role, "content": msg.content}
-                for msg in messages
-            ]
-            
-            conversation_id = str(conversation.id)
+                # Create new conversation. INSERT..RETURNING hands the id
+                # back in the same round trip (no refresh SELECT); committed
+                # here so the id is durable before the turn itself is
+                # persisted in the background
+                conversation_pk = (await db.execute(
+                    insert(models.Conversation)
+                    .values(
+                        user_id=current_user.id,
+                        conversation_type=request.conversation_type,
+                        property_id=request.property_id,
+                        meta_data=request.context or {}
+                    )
+                    .returning(models.Conversation.id)
+                )).scalar_one()
+                await db.commit()
+                history_key = _history_key(conversation_pk)
+                conversation_history = []
+
+            # Append the current turn in memory instead of re-querying
+            conversation_history.append({"role": "user", "content": request.message})
+            conversation_id = str(conversation_pk)
         else:
             # Demo mode - simple conversation without database persistence
             conversation_id = request.conversation_id or "demo-conversation"
@@ -120,59 +258,137 @@ async def send_message(
         
         # Add system prompt based on conversation type
         system_prompt = _get_system_prompt(request.conversation_type, request.property_id)
+
+        # Batch the independent cache reads this turn can use (property
+        # context, user preferences, exact semantic-cache hit) into a single
+        # pipelined Redis round trip instead of one RTT per key
+        prop_l1_context = _prop_l1_get(request.property_id) if request.property_id else None
+        fetched = {}
+        pipe = cache.pipeline()
+        if pipe is not None:
+            try:
+                async with pipe:
+                    queued = []
+                    if request.property_id and prop_l1_context is None:
+                        pipe.get(f"property_context:{request.property_id}")
+                        queued.append("prop")
+                    if settings.ENABLE_AUTHENTICATION:
+                        pipe.get(f"user_prefs:{current_user.id}")
+                        queued.append("prefs")
+                    if semantic_cache.enabled:
+                        pipe.hget(
+                            semantic_cache.exact_key(
+                                request.conversation_type,
+                                request.property_id,
+                                request.message
+                            ),
+                            "payload"
+                        )
+                        queued.append("sem")
+                    if queued:
+                        fetched = dict(zip(queued, await pipe.execute()))
+            except Exception as e:
+                logger.warning(f"Pipelined cache read failed: {e}")
+                fetched = {}
+
+        prop_raw = fetched.get("prop")
+        prefs_raw = fetched.get("prefs")
+        sem_payload = fetched.get("sem")
+
+        # On cache misses, fetch concurrently - the lookups hit different
+        # backends (Snowflake vs Postgres), so the wait is max() of the two
+        # instead of their sum. Only the preferences query touches the shared
+        # session, so there is no concurrent session use.
+        property_task = (
+            asyncio.create_task(_get_property_context(request.property_id, db))
+            if request.property_id and prop_l1_context is None and prop_raw is None
+            else None
+        )
+        prefs_task = (
+            asyncio.create_task(_get_user_preferences(current_user.id, db))
+            if settings.ENABLE_AUTHENTICATION and prefs_raw is None else None
+        )
+        property_context, user_preferences = await asyncio.gather(
+            property_task if property_task else _none(),
+            prefs_task if prefs_task else _none(),
+        )
+        if prop_l1_context is not None:
+            property_context = prop_l1_context
+        elif prop_raw is not None:
+            property_context = orjson.loads(prop_raw)
+            _prop_l1_put(request.property_id, property_context)
+        if prefs_raw is not None:
+            user_preferences = orjson.loads(prefs_raw)
         
-        # Get property context if discussing specific property
-        property_context = None
-        if request.property_id:
-            property_context = await _get_property_context(request.property_id, db)
-        
-        # Get user preferences (skip in demo mode)
-        user_preferences = None
-        if settings.ENABLE_AUTHENTICATION:
-            user_preferences = await _get_user_preferences(current_user.id, db)
+        # Semantic cache: repeat or near-duplicate questions skip the LLM
+        # call. The exact-match payload already came back in the pipeline.
+        message_embedding = None
+        cached = orjson.loads(sem_payload) if sem_payload else None
+        if cached is None and semantic_cache.enabled:
+            message_embedding = await get_embedding_service().create_embedding(request.message)
+            cached = await semantic_cache.lookup_similar(
+                request.conversation_type, request.property_id, message_embedding
+            )
+
+        if cached is not None:
+            ai_response = cached["response"]
+            sources = cached.get("sources")
+        else:
+            # Generate AI response
+            ai_response, sources = await get_llm_service().generate_response(
+                conversation_history=conversation_history,
+                system_prompt=system_prompt,
+                property_context=property_context,
+                user_preferences=user_preferences
+            )
+            await semantic_cache.store(
+                request.conversation_type,
+                request.property_id,
+                request.message,
+                message_embedding,
+                {"response": ai_response, "sources": sources}
+            )
         
-        # Generate AI response
-        ai_response, sources = await get_llm_service().generate_response(
-            conversation_history=conversation_history,
-            system_prompt=system_prompt,
-            property_context=property_context,
-            user_preferences=user_preferences
+        # The orjson round trip converts any Decimals to float at C speed
+        # instead of a recursive Python walk; used for both the DB row and
+        # the response body
+        clean_sources = (
+            orjson.loads(orjson.dumps(sources, default=_json_default))
+            if sources else None
         )
-        
-        # Save AI response to database (only if authentication is enabled)
+
+        # Append the exchange to the Redis history list now, and write both
+        # rows to Postgres after the response is on the wire - the request
+        # path never waits for the durable write
         if settings.ENABLE_AUTHENTICATION:
-            # Save AI response (convert Decimal objects to float for JSON serialization)
-            clean_sources = _convert_decimals_to_float(sources) if sources else None
-            assistant_message = models.Message(
-                conversation_id=conversation.id,
-                role="assistant",
-                content=ai_response,
-                meta_data={"sources": clean_sources} if clean_sources else {}
+            await _push_history(
+                history_key,
+                {"role": "user", "content": request.message},
+                {"role": "assistant", "content": ai_response},
+            )
+            background_tasks.add_task(
+                _persist_turn,
+                conversation_pk,
+                request.message,
+                request.context or {},
+                ai_response,
+                {"sources": clean_sources} if clean_sources else {}
             )
-            db.add(assistant_message)
-            
-            # Update conversation
-            conversation.updated_at = assistant_message.created_at
-            db.commit()
         
         # Generate suggestions
-        suggestions = await _generate_suggestions(
-            request.conversation_type,
-            ai_response,
-            property_context
-        )
+        suggestions = _generate_suggestions(request.conversation_type)
         
-        return schemas.ChatResponse(
-            conversation_id=conversation_id,
-            response=ai_response,
-            sources=sources,
-            suggestions=suggestions,
-            metadata={
+        return ORJSONResponse({
+            "conversation_id": conversation_id,
+            "response": ai_response,
+            "sources": clean_sources,
+            "suggestions": suggestions,
+            "metadata": {
                 "conversation_type": request.conversation_type,
                 "property_id": request.property_id,
                 "demo_mode": not settings.ENABLE_AUTHENTICATION
             }
-        )
+        })
         
     except Exception as e:
         logger.error(f"Error in chat endpoint: {str(e)}", exc_info=True)
@@ -182,50 +398,215 @@ async def send_message(
         )
 
 
-@router.get("/history/{conversation_id}", response_model=schemas.ConversationHistory)
+def _sse(payload: dict) -> str:
+    """Format one Server-Sent Events frame"""
+    return f"data: {orjson.dumps(payload, default=_json_default).decode()}\n\n"
+
+
+@router.post("/message/stream")
+async def send_message_stream(
+    request: schemas.ChatRequest,
+    current_user = Depends(get_optional_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Send a message and stream the reply as Server-Sent Events.
+
+    Tokens are forwarded as they arrive from the LLM provider, so the
+    time-to-first-byte is first-token latency instead of full generation
+    time. The final frame carries the conversation id and suggestions.
+    The non-streaming /message endpoint remains for clients that cannot
+    consume SSE.
+    """
+    from api.core.config import settings
+
+    # Rate limiting (skip in demo mode)
+    if settings.ENABLE_AUTHENTICATION:
+        await rate_limiter(str(current_user.id))
+
+    async def event_stream():
+        try:
+            conversation = None
+            conversation_pk = None
+            history_messages = []
+
+            if settings.ENABLE_AUTHENTICATION:
+                if request.conversation_id:
+                    conversation = (await db.execute(
+                        select(models.Conversation)
+                        .options(
+                            selectinload(models.Conversation.messages),
+                            raiseload("*")
+                        )
+                        .where(
+                            models.Conversation.id == request.conversation_id,
+                            models.Conversation.user_id == current_user.id
+                        )
+                    )).scalar_one_or_none()
+
+                    if not conversation:
+                        yield _sse({"error": "Conversation not found"})
+                        return
+                    history_messages = sorted(conversation.messages, key=lambda m: m.created_at)
+                    conversation_pk = conversation.id
+                else:
+                    conversation_pk = (await db.execute(
+                        insert(models.Conversation)
+                        .values(
+                            user_id=current_user.id,
+                            conversation_type=request.conversation_type,
+                            property_id=request.property_id,
+                            meta_data=request.context or {}
+                        )
+                        .returning(models.Conversation.id)
+                    )).scalar_one()
+                conversation_id = str(conversation_pk)
+            else:
+                conversation_id = request.conversation_id or "demo-conversation"
+
+            conversation_history = [
+                {"role": msg.role, "content": msg.content}
+                for msg in history_messages
+            ]
+            conversation_history.append({"role": "user", "content": request.message})
+
+            system_prompt = _get_system_prompt(request.conversation_type, request.property_id)
+
+            property_task = (
+                asyncio.create_task(_get_property_context(request.property_id, db))
+                if request.property_id else None
+            )
+            prefs_task = (
+                asyncio.create_task(_get_user_preferences(current_user.id, db))
+                if settings.ENABLE_AUTHENTICATION else None
+            )
+            property_context, user_preferences = await asyncio.gather(
+                property_task if property_task else _none(),
+                prefs_task if prefs_task else _none(),
+            )
+
+            # An exact semantic-cache hit streams back as a single frame
+            cached = await semantic_cache.lookup_exact(
+                request.conversation_type, request.property_id, request.message
+            )
+            if cached is not None:
+                ai_response = cached["response"]
+                yield _sse({"delta": ai_response})
+            else:
+                chunks = []
+                async for token in get_llm_service().stream_response(
+                    conversation_history=conversation_history,
+                    system_prompt=system_prompt,
+                    property_context=property_context,
+                    user_preferences=user_preferences
+                ):
+                    chunks.append(token)
+                    yield _sse({"delta": token})
+                ai_response = "".join(chunks)
+
+                await semantic_cache.store(
+                    request.conversation_type,
+                    request.property_id,
+                    request.message,
+                    None,
+                    {"response": ai_response, "sources": None}
+                )
+
+            # Persist both turns after the stream has drained, and rewrite
+            # the Redis history list so subsequent /message calls (which
+            # treat a non-empty list as the complete history) see this
+            # exchange. The history here came from Postgres, so replace the
+            # list wholesale rather than guessing at its current contents
+            if settings.ENABLE_AUTHENTICATION:
+                await _push_history(
+                    _history_key(conversation_pk),
+                    *conversation_history,
+                    {"role": "assistant", "content": ai_response},
+                    reset=True,
+                )
+                user_message = models.Message(
+                    conversation_id=conversation_pk,
+                    role="user",
+                    content=request.message,
+                    meta_data=request.context or {}
+                )
+                assistant_message = models.Message(
+                    conversation_id=conversation_pk,
+                    role="assistant",
+                    content=ai_response,
+                    meta_data={}
+                )
+                db.add_all([user_message, assistant_message])
+                if conversation is not None:
+                    conversation.updated_at = assistant_message.created_at
+                await db.commit()
+
+            yield _sse({
+                "done": True,
+                "conversation_id": conversation_id,
+                "suggestions": _generate_suggestions(request.conversation_type)
+            })
+
+        except Exception as e:
+            logger.error(f"Error in streaming chat endpoint: {str(e)}", exc_info=True)
+            yield _sse({"error": "Failed to process message"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+@router.get("/history/{conversation_id}", responses={200: {"model": schemas.ConversationHistory}})
 async def get_conversation_history(
     conversation_id: str,
+    request: Request,
     current_user: models.User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get conversation history"""
     try:
-        # Validate conversation ownership
-        conversation = db.query(models.Conversation).filter(
+        # Fetch only the conversation row first - enough to validate
+        # ownership and compute the ETag without touching the messages
+        conversation = db.query(models.Conversation).options(
+            raiseload("*")
+        ).filter(
             models.Conversation.id == conversation_id,
             models.Conversation.user_id == current_user.id
-        ).first()
-        
+        ).one_or_none()
+
         if not conversation:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Conversation not found"
             )
-        
-        # Get messages
+
+        # Weak ETag keyed on the conversation version: a polling UI gets a
+        # 304 and skips the message SELECT and serialization entirely
+        updated = conversation.updated_at or conversation.created_at
+        etag = f'W/"{int(updated.timestamp() * 1000)}"'
+        headers = {"ETag": etag, "Cache-Control": "private, max-age=5"}
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
         messages = db.query(models.Message).filter(
             models.Message.conversation_id == conversation.id
         ).order_by(models.Message.created_at).all()
-        
-        # Convert to response format
-        chat_messages = [
-            schemas.ChatMessage(
-                role=msg.role,
-                content=msg.content,
-                timestamp=msg.created_at,
-                metadata=msg.meta_data
-            )
-            for msg in messages
-        ]
-        
-        return schemas.ConversationHistory(
-            conversation_id=str(conversation.id),
-            messages=chat_messages,
-            created_at=conversation.created_at,
-            updated_at=conversation.updated_at or conversation.created_at,
-            conversation_type=conversation.conversation_type,
-            metadata=conversation.meta_data
-        )
+
+        # Serialize straight to the response; orjson handles the datetimes
+        return ORJSONResponse(headers=headers, content={
+            "conversation_id": str(conversation.id),
+            "messages": [
+                {
+                    "role": msg.role,
+                    "content": msg.content,
+                    "timestamp": msg.created_at,
+                    "metadata": msg.meta_data
+                }
+                for msg in messages
+            ],
+            "created_at": conversation.created_at,
+            "updated_at": conversation.updated_at or conversation.created_at,
+            "conversation_type": conversation.conversation_type,
+            "metadata": conversation.meta_data
+        })
         
     except HTTPException:
         raise
@@ -273,69 +654,136 @@ async def delete_conversation(
         )
 
 
-def _get_system_prompt(conversation_type: str, property_id: Optional[str] = None) -> str:
-    """Get system prompt based on conversation type"""
-    base_prompt = """You are Teddy, an AI assistant for BirdDog's land intelligence platform. 
+_BASE_PROMPT = """You are Teddy, an AI assistant for BirdDog's land intelligence platform.
     You help landowners, farmers, and hunters make informed decisions about rural properties.
     You have access to property data, soil information, agricultural insights, and market trends.
     Be helpful, accurate, and provide actionable insights."""
-    
-    type_prompts = {
-        "general": "Answer questions about land management, agriculture, and property optimization.",
-        "property_inquiry": f"You are discussing property {property_id}. Provide detailed insights about this specific property.",
-        "soil_analysis": "Focus on soil quality, composition, and agricultural potential.",
-        "crop_recommendation": "Provide crop recommendations based on soil, climate, and market conditions.",
-        "lease_assistance": "Help with agricultural lease terms, pricing, and negotiations.",
-        "tax_optimization": "Provide information about Section 180 tax deductions and other agricultural tax benefits."
-    }
-    
-    return f"{base_prompt}\n\n{type_prompts.get(conversation_type, type_prompts['general'])}"
-
-
-async def _get_property_context(property_id: str, db: Session) -> Optional[dict]:
-    """Get property context from cache or database"""
+
+_TYPE_PROMPTS = {
+    "general": "Answer questions about land management, agriculture, and property optimization.",
+    "property_inquiry": "You are discussing property {property_id}. Provide detailed insights about this specific property.",
+    "soil_analysis": "Focus on soil quality, composition, and agricultural potential.",
+    "crop_recommendation": "Provide crop recommendations based on soil, climate, and market conditions.",
+    "lease_assistance": "Help with agricultural lease terms, pricing, and negotiations.",
+    "tax_optimization": "Provide information about Section 180 tax deductions and other agricultural tax benefits."
+}
+
+# Fully-static prompts assembled once; only property_inquiry stays dynamic
+_SYSTEM_PROMPT_CACHE = {
+    conv_type: f"{_BASE_PROMPT}\n\n{prompt}"
+    for conv_type, prompt in _TYPE_PROMPTS.items()
+    if conv_type != "property_inquiry"
+}
+
+
+def _get_system_prompt(conversation_type: str, property_id: Optional[str] = None) -> str:
+    """Get system prompt based on conversation type"""
+    if conversation_type == "property_inquiry":
+        return _BASE_PROMPT + "\n\n" + _TYPE_PROMPTS["property_inquiry"].format(
+            property_id=property_id
+        )
+    return _SYSTEM_PROMPT_CACHE.get(conversation_type, _SYSTEM_PROMPT_CACHE["general"])
+
+
+# Context-field mapping from Snowflake column names to the snake_case keys
+# the LLM context block uses
+_CTX_MAP = (
+    ("parcel_id", "PARCEL_ID"),
+    ("address", "ADDRESS"),
+    ("city", "CITY"),
+    ("state", "STATE_CODE"),
+    ("county", "COUNTY_ID"),
+    ("zip_code", "ZIP_CODE"),
+    ("acreage", "ACRES"),
+    ("total_value", "TOTAL_VALUE"),
+    ("land_value", "LAND_VALUE"),
+    ("improvement_value", "IMPROVEMENT_VALUE"),
+    ("owner_name", "OWNER_NAME"),
+    ("use_code", "USECODE"),
+    ("use_description", "USEDESC"),
+    ("zoning", "ZONING"),
+    ("zoning_description", "ZONING_DESCRIPTION"),
+)
+
+
+# Process-local L1 over the Redis property-context cache, mirroring the
+# user-preferences L1: property_id -> (expiry, context)
+_PROP_L1_TTL = 600
+_PROP_L1_MAX = 1024
+_prop_l1: dict = {}
+
+
+def _prop_l1_get(property_id: str) -> Optional[dict]:
+    hit = _prop_l1.get(property_id)
+    if hit is not None and hit[0] > time.monotonic():
+        return hit[1]
+    return None
+
+
+def _prop_l1_put(property_id: str, context: Optional[dict]) -> None:
+    if len(_prop_l1) >= _PROP_L1_MAX:
+        _prop_l1.clear()
+    _prop_l1[property_id] = (time.monotonic() + _PROP_L1_TTL, context)
+
+
+# Per-property locks so N concurrent cold-cache requests for the same
+# property make one Snowflake query instead of N (cache stampede)
+_prop_locks: defaultdict = defaultdict(asyncio.Lock)
+
+
+async def _get_property_context(property_id: str, db: AsyncSession) -> Optional[dict]:
+    """Get property context (L1 dict -> Redis -> Snowflake)"""
+    context = _prop_l1_get(property_id)
+    if context is not None:
+        return context
+
     # Check cache first
     cache_key = f"property_context:{property_id}"
     cached_context = await cache.get(cache_key)
-    
+
     if cached_context:
-        import json
-        return json.loads(cached_context)
-    
-    # Fetch from Snowflake database
+        context = orjson.loads(cached_context)
+        _prop_l1_put(property_id, context)
+        return context
+
+    lock = _prop_locks[property_id]
     try:
-        from data_connectors.snowflake_connector import SnowflakeConnector
-        snowflake_connector = SnowflakeConnector()
-        
+        async with lock:
+            # Double-checked: whoever held the lock before us has likely
+            # populated the cache already
+            cached_context = await cache.get(cache_key)
+            if cached_context:
+                context = orjson.loads(cached_context)
+                _prop_l1_put(property_id, context)
+                return context
+            return await _fetch_property_context(property_id, cache_key)
+    finally:
+        # Best-effort cleanup so the lock table doesn't grow unboundedly;
+        # late waiters still hold a reference to the popped lock object
+        if not lock.locked():
+            _prop_locks.pop(property_id, None)
+
+
+async def _fetch_property_context(property_id: str, cache_key: str) -> Optional[dict]:
+    """Fetch property context from Snowflake and populate both caches"""
+    try:
+        # Shared connector - each fresh one costs a Snowflake session handshake
+        snowflake_connector = get_snowflake_connector()
+
         # Get property boundaries and basic info
         property_data = await snowflake_connector.get_property_boundaries(property_id)
         if not property_data:
             return None
         
-        # Build context from real data using correct column names
-        context = {
-            "property_id": property_id,
-            "parcel_id": property_data.get("PARCEL_ID"),
-            "address": property_data.get("ADDRESS"),
-            "city": property_data.get("CITY"),
-            "state": property_data.get("STATE_CODE"),
-            "county": property_data.get("COUNTY_ID"),
-            "zip_code": property_data.get("ZIP_CODE"),
-            "acreage": property_data.get("ACRES"),
-            "total_value": property_data.get("TOTAL_VALUE"),
-            "land_value": property_data.get("LAND_VALUE"),
-            "improvement_value": property_data.get("IMPROVEMENT_VALUE"),
-            "owner_name": property_data.get("OWNER_NAME"),
-            "use_code": property_data.get("USECODE"),
-            "use_description": property_data.get("USEDESC"),
-            "zoning": property_data.get("ZONING"),
-            "zoning_description": property_data.get("ZONING_DESCRIPTION")
-        }
-        
-        # Cache for future use
-        import json
-        await cache.set(cache_key, json.dumps(context), ttl=3600)
+        # Build context from real data via the precomputed column mapping
+        context = {key: property_data.get(col) for key, col in _CTX_MAP}
+        context["property_id"] = property_id
         
+        # Cache for future use; default=str covers the Decimals Snowflake
+        # returns for money/acreage columns
+        await cache.set(cache_key, orjson.dumps(context, default=str), ttl=3600)
+        _prop_l1_put(property_id, context)
+
         return context
         
     except Exception as e:
@@ -343,62 +791,84 @@ async def _get_property_context(property_id: str, db: Session) -> Optional[dict]
         return None
 
 
-async def _get_user_preferences(user_id: str, db: Session) -> Optional[dict]:
-    """Get user preferences"""
-    prefs = db.query(models.UserPreference).filter(
-        models.UserPreference.user_id == user_id
-    ).first()
-    
-    if prefs:
-        return {
+# Process-local L1 over the Redis preferences cache: user_id -> (expiry, prefs).
+# Preferences change rarely, so 30s of staleness is acceptable for skipping
+# even the Redis round trip on back-to-back messages from the same user
+_PREFS_L1_TTL = 30
+_PREFS_L1_MAX = 1024
+_prefs_l1: dict = {}
+
+
+async def _get_user_preferences(user_id: str, db: AsyncSession) -> Optional[dict]:
+    """Get user preferences (L1 dict -> Redis -> Postgres)"""
+    now = time.monotonic()
+    hit = _prefs_l1.get(user_id)
+    if hit is not None and hit[0] > now:
+        return hit[1]
+
+    cache_key = f"user_prefs:{user_id}"
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        prefs_dict = orjson.loads(cached)
+    else:
+        prefs = (await db.execute(
+            select(models.UserPreference).where(
+                models.UserPreference.user_id == user_id
+            )
+        )).scalar_one_or_none()
+
+        prefs_dict = {
             "preferred_crops": prefs.preferred_crops,
             "preferred_locations": prefs.preferred_locations,
             "acreage_range": {
                 "min": prefs.min_acreage,
                 "max": prefs.max_acreage
             }
-        }
-    
-    return None
+        } if prefs else None
+        # "None" is cached too, so users without preferences don't re-query
+        await cache.set(cache_key, orjson.dumps(prefs_dict), ttl=600)
 
+    if len(_prefs_l1) >= _PREFS_L1_MAX:
+        _prefs_l1.clear()
+    _prefs_l1[user_id] = (now + _PREFS_L1_TTL, prefs_dict)
+    return prefs_dict
 
-async def _generate_suggestions(
-    conversation_type: str,
-    ai_response: str,
-    property_context: Optional[dict]
-) -> Optional[list]:
-    """Generate follow-up suggestions"""
-    suggestions = {
-        "general": [
-            "Tell me about soil quality analysis",
-            "What crops are best for my region?",
-            "How can I optimize my land revenue?"
-        ],
-        "property_inquiry": [
-            "What crops would grow best here?",
-            "What's the lease value for this property?",
-            "Is this property eligible for Section 180?"
-        ],
-        "soil_analysis": [
-            "What amendments would improve soil quality?",
-            "Compare with nearby properties",
-            "Show historical soil data"
-        ],
-        "crop_recommendation": [
-            "What's the expected yield?",
-            "Show market prices for these crops",
-            "What's the planting calendar?"
-        ],
-        "lease_assistance": [
-            "Generate a lease agreement template",
-            "What are typical lease terms in this area?",
-            "How do I find qualified farmers?"
-        ],
-        "tax_optimization": [
-            "Calculate my Section 180 deduction",
-            "What documentation do I need?",
-            "Show other tax incentives"
-        ]
-    }
-    
-    return suggestions.get(conversation_type, suggestions["general"])
+
+# Static follow-up suggestions, as tuples so they can't be mutated in place
+_SUGGESTIONS = {
+    "general": (
+        "Tell me about soil quality analysis",
+        "What crops are best for my region?",
+        "How can I optimize my land revenue?"
+    ),
+    "property_inquiry": (
+        "What crops would grow best here?",
+        "What's the lease value for this property?",
+        "Is this property eligible for Section 180?"
+    ),
+    "soil_analysis": (
+        "What amendments would improve soil quality?",
+        "Compare with nearby properties",
+        "Show historical soil data"
+    ),
+    "crop_recommendation": (
+        "What's the expected yield?",
+        "Show market prices for these crops",
+        "What's the planting calendar?"
+    ),
+    "lease_assistance": (
+        "Generate a lease agreement template",
+        "What are typical lease terms in this area?",
+        "How do I find qualified farmers?"
+    ),
+    "tax_optimization": (
+        "Calculate my Section 180 deduction",
+        "What documentation do I need?",
+        "Show other tax incentives"
+    )
+}
+
+
+def _generate_suggestions(conversation_type: str) -> list:
+    """Get follow-up suggestions for the conversation type"""
+    return list(_SUGGESTIONS.get(conversation_type, _SUGGESTIONS["general"]))
@@ -1,13 +1,18 @@
 """
 Insights endpoint for property intelligence and analysis
 """
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.responses import StreamingResponse
 from typing import List, Dict, Any, Optional
+from datetime import date, datetime
+from decimal import Decimal
+import asyncio
+import hashlib
 import logging
-import json
+import numpy as np
+import orjson
 
-from api.core.dependencies import get_db, cache, get_optional_current_user
+from api.core.dependencies import cache, get_optional_current_user
 from api.core.security import get_current_active_user
 from api.models import database as models
 from api.models import schemas
@@ -34,51 +39,66 @@ def get_llm_service():
     return _llm_service
 
 
+# In-flight insight computations keyed by cache key: concurrent requests for
+# the same property share one Snowflake + LLM run instead of each paying it
+_inflight: Dict[str, asyncio.Future] = {}
+
+
 @router.get("/property/{property_id}")
 async def get_property_insights(
     property_id: str,
-    current_user = Depends(get_optional_current_user()),
-    db: Session = Depends(get_db)
+    refresh: bool = False,
+    mode: str = "auto",
+    current_user = Depends(get_optional_current_user)
 ):
-    """Get comprehensive insights for a specific property using real data and LLM analysis"""
+    """Get comprehensive insights for a specific property using real data and LLM analysis.
+
+    mode=llm forces the LLM analysis, mode=basic forces the rule-based
+    analysis, and mode=auto (default) skips the LLM for data-sparse
+    properties where it adds little over the rules.
+    """
     try:
         from api.core.config import settings
-        
-        # Get Snowflake connector
-        snowflake_conn = get_snowflake_connector()
-        
-        # Gather comprehensive property data
-        property_data = await _gather_comprehensive_property_data(snowflake_conn, property_id)
-        
-        if not property_data:
+
+        if mode not in ("auto", "basic", "llm"):
             raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Property {property_id} not found"
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="mode must be one of: auto, basic, llm"
             )
-        
-        # Generate LLM-powered insights
-        insights = await _generate_property_insights(property_data)
-        
-        # Calculate overall property score
-        overall_score = _calculate_property_score(property_data)
-        
-        # Format response
-        return {
-            "success": True,
-            "property_id": property_id,
-            "overall_score": overall_score,
-            "insights": insights,
-            "data_summary": {
-                "parcel_data": bool(property_data.get("parcel_profile")),
-                "soil_data": bool(property_data.get("soil_profile")),
-                "crop_history": bool(property_data.get("crop_history")),
-                "climate_data": bool(property_data.get("climate_data")),
-                "topography_data": bool(property_data.get("topography_data")),
-                "comprehensive_analysis": bool(property_data.get("comprehensive_analysis"))
-            },
-            "raw_data": property_data if settings.ENABLE_AUTHENTICATION else None  # Only show raw data in auth mode
-        }
-        
+
+        # The underlying data changes on the order of days, so repeat
+        # requests are served from cache instead of re-running seven
+        # Snowflake queries plus an LLM call; ?refresh=true bypasses the
+        # read but still refreshes the cached copy
+        cache_key = f"insights:v1:{property_id}:{settings.ENABLE_AUTHENTICATION}:{mode}"
+        if not refresh:
+            cached = await cache.get(cache_key)
+            if cached:
+                # The cached value is the serialized body - hand it straight
+                # back without a decode/re-encode cycle
+                return Response(content=cached, media_type="application/json")
+
+            # Join an identical computation already in flight
+            fut = _inflight.get(cache_key)
+            if fut is not None:
+                return Response(content=await fut, media_type="application/json")
+
+        fut = asyncio.get_running_loop().create_future()
+        # Mark the exception retrieved even when no follower is waiting, so a
+        # failed run doesn't log "exception was never retrieved"
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        _inflight[cache_key] = fut
+        try:
+            body = await _build_property_insights(property_id, cache_key, mode)
+            fut.set_result(body)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            _inflight.pop(cache_key, None)
+
+        return Response(content=body, media_type="application/json")
+
     except HTTPException:
         raise
     except Exception as e:
@@ -89,107 +109,247 @@ async def get_property_insights(
         )
 
 
+# Data sources counted when deciding whether a property has enough signal
+# to be worth an LLM call
+_SIGNAL_KEYS = (
+    "parcel_profile", "soil_profile", "crop_history",
+    "climate_data", "topography_data", "comprehensive_analysis",
+)
+
+
+async def _build_property_insights(property_id: str, cache_key: str, mode: str = "auto") -> bytes:
+    """Run the full insights pipeline and return the serialized body"""
+    from api.core.config import settings
+
+    # Get Snowflake connector
+    snowflake_conn = get_snowflake_connector()
+
+    # Gather comprehensive property data
+    property_data = await _gather_comprehensive_property_data(snowflake_conn, property_id)
+
+    if not property_data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Property {property_id} not found"
+        )
+
+    # Data-sparse properties gain little from the LLM over the rule-based
+    # analysis; skipping the call saves its full latency and cost
+    populated = sum(1 for key in _SIGNAL_KEYS if property_data.get(key))
+    use_llm = mode == "llm" or (mode == "auto" and populated >= settings.LLM_MIN_SIGNALS)
+
+    if use_llm:
+        # Generate LLM-powered insights
+        insights = await _generate_property_insights(property_data)
+    else:
+        insights = _generate_basic_insights(property_data)
+        insights["analysis_type"] = "basic"
+
+    # Calculate overall property score
+    overall_score = _calculate_property_score(property_data)
+
+    # Format response
+    response = {
+        "success": True,
+        "property_id": property_id,
+        "overall_score": overall_score,
+        "insights": insights,
+        "data_summary": {
+            "parcel_data": bool(property_data.get("parcel_profile")),
+            "soil_data": bool(property_data.get("soil_profile")),
+            "crop_history": bool(property_data.get("crop_history")),
+            "climate_data": bool(property_data.get("climate_data")),
+            "topography_data": bool(property_data.get("topography_data")),
+            "comprehensive_analysis": bool(property_data.get("comprehensive_analysis"))
+        },
+        "raw_data": property_data if settings.ENABLE_AUTHENTICATION else None  # Only show raw data in auth mode
+    }
+
+    # Serialize once - the same orjson bytes feed the cache and the
+    # response, skipping jsonable_encoder for the large raw_data block;
+    # default=str covers Decimals and timestamps from Snowflake
+    body = orjson.dumps(response, default=str)
+    await cache.set(cache_key, body, ttl=3600)
+
+    return body
+
+
+def _sse(payload: Dict[str, Any]) -> str:
+    """Serialize one server-sent-event frame"""
+    return f"data: {orjson.dumps(payload, default=str).decode()}\n\n"
+
+
+@router.get("/property/{property_id}/stream")
+async def stream_property_insights(
+    property_id: str,
+    current_user = Depends(get_optional_current_user)
+):
+    """Stream property insights as SSE: score and data summary first, then
+    LLM analysis tokens as they are generated instead of after full decode"""
+
+    async def event_stream():
+        try:
+            snowflake_conn = get_snowflake_connector()
+            property_data = await _gather_comprehensive_property_data(snowflake_conn, property_id)
+            if not property_data:
+                yield _sse({"error": f"Property {property_id} not found"})
+                return
+
+            # Everything that doesn't need the LLM goes out immediately
+            yield _sse({
+                "property_id": property_id,
+                "overall_score": _calculate_property_score(property_data),
+                "data_summary": {
+                    "parcel_data": bool(property_data.get("parcel_profile")),
+                    "soil_data": bool(property_data.get("soil_profile")),
+                    "crop_history": bool(property_data.get("crop_history")),
+                    "climate_data": bool(property_data.get("climate_data")),
+                    "topography_data": bool(property_data.get("topography_data")),
+                    "comprehensive_analysis": bool(property_data.get("comprehensive_analysis"))
+                }
+            })
+
+            data_summary = _prepare_data_summary_for_llm(property_data)
+            conversation_history = [
+                {"role": "system", "content": _INSIGHTS_SYSTEM_PROMPT},
+                {"role": "user", "content": f"Please analyze this property data and provide comprehensive insights:\n\n{data_summary}"}
+            ]
+            async for chunk in get_llm_service().stream_response(
+                conversation_history=conversation_history,
+                system_prompt=_INSIGHTS_SYSTEM_PROMPT
+            ):
+                yield _sse({"delta": chunk})
+
+            yield _sse({"done": True})
+
+        except Exception as e:
+            # The response has already started - surface errors as a frame
+            logger.error(f"Error streaming insights for {property_id}: {str(e)}", exc_info=True)
+            yield _sse({"error": "Failed to stream property insights"})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+def _normalize_snowflake_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert Snowflake value types to plain Python once at the boundary.
+
+    Decimal becomes float and datetime becomes an ISO string, so downstream
+    formatters and scoring can use values directly instead of each guarding
+    with float(...) conversions, and orjson needs no default= fallback.
+    """
+    return {
+        key: (
+            float(value) if isinstance(value, Decimal)
+            else value.isoformat() if isinstance(value, (datetime, date))
+            else value
+        )
+        for key, value in row.items()
+    }
+
+
 async def _gather_comprehensive_property_data(snowflake_conn: SnowflakeConnector, property_id: str) -> Dict[str, Any]:
     """Gather all available data for a property from Snowflake"""
     property_data = {}
-    
-    try:
-        # 1. Get parcel profile (basic property information)
-        logger.info(f"Fetching parcel profile for {property_id}")
-        parcel_profile = await snowflake_conn.get_property_boundaries(property_id)
-        if parcel_profile:
-            property_data["parcel_profile"] = parcel_profile
-        
-        # 2. Get soil profile data
-        logger.info(f"Fetching soil profile for {property_id}")
-        soil_profile = await snowflake_conn.get_soil_data(property_id)
-        if soil_profile:
-            property_data["soil_profile"] = soil_profile
-        
-        # 3. Get crop history
-        logger.info(f"Fetching crop history for {property_id}")
-        crop_history = await snowflake_conn.get_crop_history(property_id, years=10)
-        if crop_history:
-            property_data["crop_history"] = crop_history
-        
-        # 4. Get climate data
-        logger.info(f"Fetching climate data for {property_id}")
-        climate_data = await snowflake_conn.get_climate_data(property_id)
-        if climate_data:
-            property_data["climate_data"] = climate_data
-        
-        # 5. Get topography data
-        logger.info(f"Fetching topography data for {property_id}")
-        topography_data = await snowflake_conn.get_topography_data(property_id)
-        if topography_data:
-            property_data["topography_data"] = topography_data
-        
-        # 6. Get comprehensive analysis
-        logger.info(f"Fetching comprehensive analysis for {property_id}")
-        comprehensive_analysis = await snowflake_conn.get_comprehensive_analysis(property_id)
-        if comprehensive_analysis:
-            property_data["comprehensive_analysis"] = comprehensive_analysis
-        
-        # 7. Get Section 180 estimates
-        logger.info(f"Fetching Section 180 estimates for {property_id}")
-        section_180_estimates = await snowflake_conn.get_section_180_estimates(property_id)
-        if section_180_estimates:
-            property_data["section_180_estimates"] = section_180_estimates
-        
-        logger.info(f"Gathered data for {property_id}: {list(property_data.keys())}")
-        return property_data
-        
-    except Exception as e:
-        logger.error(f"Error gathering property data for {property_id}: {str(e)}", exc_info=True)
-        return property_data
 
+    # The queries are independent, so run them concurrently - total
+    # wall-clock time becomes the slowest call instead of the sum of all.
+    # The four single-row datasets (climate, topography, comprehensive,
+    # section 180) arrive fused as one profile query
+    tasks = {
+        "parcel_profile": snowflake_conn.get_property_boundaries(property_id),
+        "soil_profile": snowflake_conn.get_soil_data(property_id),
+        "crop_history": snowflake_conn.get_crop_history(property_id, years=10),
+        "profile": snowflake_conn.get_property_profile(property_id),
+    }
+    results = await asyncio.gather(*tasks.values(), return_exceptions=True)
 
-async def _generate_property_insights(property_data: Dict[str, Any]) -> Dict[str, Any]:
-    """Generate comprehensive insights using LLM analysis"""
-    try:
-        llm_service = get_llm_service()
-        
-        # Prepare data summary for LLM
-        data_summary = _prepare_data_summary_for_llm(property_data)
-        
-        # Create system prompt for property analysis
-        system_prompt = """You are an expert agricultural and land analysis consultant. 
+    for key, result in zip(tasks, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error fetching {key} for {property_id}: {result}")
+        elif key == "profile":
+            for dataset, row in result.items():
+                if row:
+                    property_data[dataset] = _normalize_snowflake_row(row)
+        elif result:
+            if isinstance(result, list):
+                property_data[key] = [_normalize_snowflake_row(row) for row in result]
+            else:
+                property_data[key] = _normalize_snowflake_row(result)
+
+    logger.info(f"Gathered data for {property_id}: {list(property_data.keys())}")
+    return property_data
+
+
+# System prompt for single-property analysis - built once at import instead
+# of reallocating the string on every request
+_INSIGHTS_SYSTEM_PROMPT = """You are an expert agricultural and land analysis consultant.
+        The property data you receive is compact JSON keyed by data source
+        (parcel, soil_components, crop_history, climate, topography,
+        land_cover, section_180_estimates).
         Analyze the provided property data and generate comprehensive insights covering:
-        
+
         1. SOIL QUALITY ANALYSIS
         - Soil composition and health
         - Agricultural suitability
         - Improvement recommendations
-        
+
         2. AGRICULTURAL POTENTIAL
         - Best crop recommendations
         - Yield expectations
         - Rotation strategies
-        
+
         3. LAND USE OPTIMIZATION
         - Current vs optimal land use
         - Revenue maximization opportunities
         - Conservation considerations
-        
+
         4. INVESTMENT ANALYSIS
         - Property valuation insights
         - Market positioning
         - Risk assessment
-        
+
         5. REGULATORY OPPORTUNITIES
         - Tax incentives (Section 180, etc.)
         - Conservation programs
         - Compliance considerations
-        
+
         Provide specific, actionable insights based on the data. Be concise but comprehensive.
         Format your response as structured insights with clear categories and recommendations."""
-        
+
+
+# Derived values memoized by property_data content: identical data bytes
+# always produce the same summary text and score, so repeat computation
+# (portfolio/compare runs, ?refresh=true with unchanged data) is skipped.
+# Bounded the same way as the other in-process caches: clear when full.
+_MEMO_MAX = 512
+_summary_memo: Dict[bytes, str] = {}
+_score_memo: Dict[bytes, float] = {}
+
+
+def _property_data_digest(property_data: Dict[str, Any]) -> bytes:
+    """Stable digest of property_data via its canonical orjson encoding"""
+    return hashlib.blake2b(
+        orjson.dumps(property_data, option=orjson.OPT_SORT_KEYS, default=str),
+        digest_size=16,
+    ).digest()
+
+
+async def _generate_property_insights(property_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate comprehensive insights using LLM analysis"""
+    try:
+        llm_service = get_llm_service()
+
+        # Prepare data summary for LLM
+        data_summary = _prepare_data_summary_for_llm(property_data)
+
+        system_prompt = _INSIGHTS_SYSTEM_PROMPT
+
         # Generate insights using LLM
         conversation_history = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": f"Please analyze this property data and provide comprehensive insights:\n\n{data_summary}"}
         ]
-        
+
         insights_text, _ = await llm_service.generate_response(
             conversation_history=conversation_history,
             system_prompt=system_prompt
@@ -210,116 +370,130 @@ async def _generate_property_insights(property_data: Dict[str, Any]) -> Dict[str
 
 def _prepare_data_summary_for_llm(property_data: Dict[str, Any]) -> str:
     """Prepare a structured summary of property data for LLM analysis"""
-    summary_parts = []
-    
-    # Parcel Profile Summary
+    digest = _property_data_digest(property_data)
+    cached = _summary_memo.get(digest)
+    if cached is not None:
+        return cached
+
+    summary = _build_data_summary(property_data)
+    if len(_summary_memo) >= _MEMO_MAX:
+        _summary_memo.clear()
+    _summary_memo[digest] = summary
+    return summary
+
+
+# Tight per-section whitelists of the fields the analysis actually needs;
+# everything else (geojson blobs, ids, audit columns) stays out of the prompt
+_PARCEL_KEYS = (
+    "PARCEL_ID", "ADDRESS", "CITY", "STATE_CODE", "COUNTY_ID", "ACRES",
+    "TOTAL_VALUE", "LAND_VALUE", "USECODE", "USEDESC", "ZONING",
+    "ZONING_DESCRIPTION",
+)
+_SOIL_KEYS = (
+    "COMPONENT_PERCENTAGE", "SOIL_SERIES", "SOIL_TYPE", "FERTILITY_CLASS",
+    "PH_LEVEL", "ORGANIC_MATTER_PCT", "DRAINAGE_CLASS",
+    "AGRICULTURAL_CAPABILITY", "AVAILABLE_WATER_CAPACITY",
+)
+_CLIMATE_KEYS = (
+    "ANNUAL_PRECIPITATION_INCHES", "GROWING_DEGREE_DAYS", "AVG_TEMPERATURE_F",
+    "CLIMATE_CLASSIFICATION",
+)
+_TOPO_KEYS = (
+    "MEAN_ELEVATION_FT", "MIN_ELEVATION_FT", "MAX_ELEVATION_FT",
+    "SLOPE_PERCENT", "TERRAIN_ANALYSIS",
+)
+_LAND_COVER_KEYS = (
+    "DOMINANT_COVER_TYPE", "DOMINANT_COVER_PERCENTAGE",
+    "AGRICULTURAL_PERCENTAGE", "FOREST_PERCENTAGE", "DEVELOPED_PERCENTAGE",
+    "AGRICULTURAL_CLASSIFICATION", "SECTION_180_POTENTIAL",
+)
+_SECTION_180_KEYS = ("TOTAL_DEDUCTION", "CONFIDENCE_SCORE", "METHODOLOGY")
+
+
+def _keep(row: Dict[str, Any], keys) -> Dict[str, Any]:
+    """Project a row down to the whitelisted non-null fields"""
+    return {key: row[key] for key in keys if row.get(key) is not None}
+
+
+_crop_stats_memo: Dict[bytes, Dict[str, Any]] = {}
+
+
+def _crop_stats(crop_history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate crop_history once for both the summary text and the score.
+
+    The summary needs per-type counts and year ranges, the score needs
+    unique year/type counts; one fused pass produces both, memoized by the
+    history's content digest so compare/portfolio runs share it.
+    """
+    digest = hashlib.blake2b(
+        orjson.dumps(crop_history, option=orjson.OPT_SORT_KEYS, default=str),
+        digest_size=16,
+    ).digest()
+    stats = _crop_stats_memo.get(digest)
+    if stats is not None:
+        return stats
+
+    types_arr = np.array([str(crop.get('CROP_TYPE') or 'Unknown') for crop in crop_history])
+    years_arr = np.fromiter(
+        (int(crop.get('CROP_YEAR') or 0) for crop in crop_history),
+        dtype=np.int32, count=len(crop_history)
+    )
+    by_type = {}
+    for crop_type in np.unique(types_arr):
+        years = years_arr[types_arr == crop_type]
+        by_type[str(crop_type)] = (int(years.size), int(years.min()), int(years.max()))
+    stats = {
+        "by_type": by_type,
+        "unique_years": int(np.unique(years_arr).size),
+        "unique_types": len(by_type),
+    }
+    if len(_crop_stats_memo) >= _MEMO_MAX:
+        _crop_stats_memo.clear()
+    _crop_stats_memo[digest] = stats
+    return stats
+
+
+def _build_data_summary(property_data: Dict[str, Any]) -> str:
+    """Render the property data as compact JSON for the prompt (uncached).
+
+    Prefill cost scales with input length, so the old multi-section prose
+    block is replaced by whitelisted compact JSON - same information in
+    roughly half the tokens.
+    """
+    doc: Dict[str, Any] = {}
+
     if "parcel_profile" in property_data:
-        parcel = property_data["parcel_profile"]
-        
-        # Safe formatting for monetary values - convert Decimal to float
-        total_value = parcel.get('TOTAL_VALUE')
-        total_value_str = f"${float(total_value):,.0f}" if total_value is not None else 'N/A'
-        
-        land_value = parcel.get('LAND_VALUE')
-        land_value_str = f"${float(land_value):,.0f}" if land_value is not None else 'N/A'
-        
-        summary_parts.append(f"""
-PROPERTY OVERVIEW:
-- Parcel ID: {parcel.get('PARCEL_ID', 'N/A')}
-- Address: {parcel.get('ADDRESS', 'N/A')}, {parcel.get('CITY', 'N/A')}, {parcel.get('STATE_CODE', 'N/A')}
-- County: {parcel.get('COUNTY_ID', 'N/A')}
-- Total Acreage: {parcel.get('ACRES', 'N/A')} acres
-- Total Value: {total_value_str}
-- Land Value: {land_value_str}
-- Use Code: {parcel.get('USECODE', 'N/A')} - {parcel.get('USEDESC', 'N/A')}
-- Zoning: {parcel.get('ZONING', 'N/A')} - {parcel.get('ZONING_DESCRIPTION', 'N/A')}
-""")
-    
-    # Soil Profile Summary
-    if "soil_profile" in property_data:
-        soil_data = property_data["soil_profile"]
-        if soil_data:
-            summary_parts.append("\nSOIL ANALYSIS:")
-            for i, soil in enumerate(soil_data[:3]):  # Top 3 soil components
-                summary_parts.append(f"""
-- Soil Component {i+1} ({soil.get('COMPONENT_PERCENTAGE', 'N/A')}% of property):
-  * Series: {soil.get('SOIL_SERIES', 'N/A')}
-  * Type: {soil.get('SOIL_TYPE', 'N/A')}
-  * Fertility Class: {soil.get('FERTILITY_CLASS', 'N/A')}
-  * pH Level: {soil.get('PH_LEVEL', 'N/A')}
-  * Organic Matter: {soil.get('ORGANIC_MATTER_PCT', 'N/A')}%
-  * Drainage: {soil.get('DRAINAGE_CLASS', 'N/A')}
-  * Agricultural Capability: {soil.get('AGRICULTURAL_CAPABILITY', 'N/A')}
-  * Available Water Capacity: {soil.get('AVAILABLE_WATER_CAPACITY', 'N/A')}
-""")
-    
-    # Crop History Summary
-    if "crop_history" in property_data:
-        crop_history = property_data["crop_history"]
-        if crop_history:
-            summary_parts.append(f"\nCROP HISTORY ({len(crop_history)} records):")
-            crop_summary = {}
-            for crop in crop_history:
-                crop_type = crop.get('CROP_TYPE', 'Unknown')
-                year = crop.get('CROP_YEAR', 'Unknown')
-                if crop_type not in crop_summary:
-                    crop_summary[crop_type] = []
-                crop_summary[crop_type].append(year)
-            
-            for crop_type, years in crop_summary.items():
-                summary_parts.append(f"- {crop_type}: {len(years)} years ({min(years) if years else 'N/A'}-{max(years) if years else 'N/A'})")
-    
-    # Climate Data Summary
+        doc["parcel"] = _keep(property_data["parcel_profile"], _PARCEL_KEYS)
+
+    soil_data = property_data.get("soil_profile")
+    if soil_data:
+        # Top 3 soil components
+        doc["soil_components"] = [_keep(soil, _SOIL_KEYS) for soil in soil_data[:3]]
+
+    crop_history = property_data.get("crop_history")
+    if crop_history:
+        stats = _crop_stats(crop_history)
+        doc["crop_history"] = {
+            "records": len(crop_history),
+            "by_type": {
+                crop_type: {"years_grown": count, "first_year": min_year, "last_year": max_year}
+                for crop_type, (count, min_year, max_year) in stats["by_type"].items()
+            },
+        }
+
     if "climate_data" in property_data:
-        climate = property_data["climate_data"]
-        summary_parts.append(f"""
-CLIMATE DATA:
-- Annual Precipitation: {climate.get('ANNUAL_PRECIPITATION_INCHES', 'N/A')} inches
-- Growing Degree Days: {climate.get('GROWING_DEGREE_DAYS', 'N/A')}
-- Average Temperature: {climate.get('AVG_TEMPERATURE_F', 'N/A')}°F
-- Climate Classification: {climate.get('CLIMATE_CLASSIFICATION', 'N/A')}
-""")
-    
-    # Topography Summary
+        doc["climate"] = _keep(property_data["climate_data"], _CLIMATE_KEYS)
+
     if "topography_data" in property_data:
-        topo = property_data["topography_data"]
-        summary_parts.append(f"""
-TOPOGRAPHY:
-- Mean Elevation: {topo.get('MEAN_ELEVATION_FT', 'N/A')} ft
-- Elevation Range: {topo.get('MIN_ELEVATION_FT', 'N/A')} - {topo.get('MAX_ELEVATION_FT', 'N/A')} ft
-- Slope: {topo.get('SLOPE_PERCENT', 'N/A')}%
-- Terrain Analysis: {topo.get('TERRAIN_ANALYSIS', 'N/A')}
-""")
-    
-    # Comprehensive Analysis Summary
+        doc["topography"] = _keep(property_data["topography_data"], _TOPO_KEYS)
+
     if "comprehensive_analysis" in property_data:
-        comp = property_data["comprehensive_analysis"]
-        summary_parts.append(f"""
-LAND COVER ANALYSIS:
-- Dominant Cover Type: {comp.get('DOMINANT_COVER_TYPE', 'N/A')} ({comp.get('DOMINANT_COVER_PERCENTAGE', 'N/A')}%)
-- Agricultural Percentage: {comp.get('AGRICULTURAL_PERCENTAGE', 'N/A')}%
-- Forest Percentage: {comp.get('FOREST_PERCENTAGE', 'N/A')}%
-- Developed Percentage: {comp.get('DEVELOPED_PERCENTAGE', 'N/A')}%
-- Agricultural Classification: {comp.get('AGRICULTURAL_CLASSIFICATION', 'N/A')}
-- Section 180 Potential: {comp.get('SECTION_180_POTENTIAL', 'N/A')}
-""")
-    
-    # Section 180 Estimates
+        doc["land_cover"] = _keep(property_data["comprehensive_analysis"], _LAND_COVER_KEYS)
+
     if "section_180_estimates" in property_data:
-        s180 = property_data["section_180_estimates"]
-        
-        # Safe formatting for deduction amount - convert Decimal to float
-        total_deduction = s180.get('TOTAL_DEDUCTION')
-        deduction_str = f"${float(total_deduction):,.0f}" if total_deduction is not None else 'N/A'
-        
-        summary_parts.append(f"""
-SECTION 180 TAX DEDUCTION ESTIMATES:
-- Total Deduction Potential: {deduction_str}
-- Confidence Score: {s180.get('CONFIDENCE_SCORE', 'N/A')}/100
-- Methodology: {s180.get('METHODOLOGY', 'N/A')}
-""")
-    
-    return "\n".join(summary_parts)
+        doc["section_180_estimates"] = _keep(property_data["section_180_estimates"], _SECTION_180_KEYS)
+
+    return orjson.dumps(doc).decode()
 
 
 def _parse_llm_insights(insights_text: str) -> Dict[str, Any]:
@@ -362,6 +536,20 @@ def _generate_basic_insights(property_data: Dict[str, Any]) -> Dict[str, Any]:
 
 def _calculate_property_score(property_data: Dict[str, Any]) -> float:
     """Calculate an overall property score based on available data"""
+    digest = _property_data_digest(property_data)
+    cached = _score_memo.get(digest)
+    if cached is not None:
+        return cached
+
+    score = _compute_property_score(property_data)
+    if len(_score_memo) >= _MEMO_MAX:
+        _score_memo.clear()
+    _score_memo[digest] = score
+    return score
+
+
+def _compute_property_score(property_data: Dict[str, Any]) -> float:
+    """Score the property from its raw data (uncached)"""
     score = 0.0
     factors = 0
     
@@ -383,16 +571,15 @@ def _calculate_property_score(property_data: Dict[str, Any]) -> float:
         comp = property_data["comprehensive_analysis"]
         ag_percentage = comp.get('AGRICULTURAL_PERCENTAGE', 0)
         if ag_percentage:
-            # Convert to float to handle Decimal types from Snowflake
-            ag_percentage_float = float(ag_percentage) if ag_percentage is not None else 0.0
-            score += min(ag_percentage_float, 100.0)
+            # Already a plain float - rows are normalized at fetch time
+            score += min(ag_percentage, 100.0)
             factors += 1
     
-    # Crop history factor (diversity and consistency)
+    # Crop history factor (diversity and consistency) - shares the fused
+    # aggregation pass with the data summary
     if "crop_history" in property_data and property_data["crop_history"]:
-        crop_years = len(set(crop.get('CROP_YEAR') for crop in property_data["crop_history"]))
-        crop_types = len(set(crop.get('CROP_TYPE') for crop in property_data["crop_history"]))
-        history_score = min((crop_years * 10) + (crop_types * 5), 100.0)
+        stats = _crop_stats(property_data["crop_history"])
+        history_score = min((stats["unique_years"] * 10) + (stats["unique_types"] * 5), 100.0)
         score += float(history_score)
         factors += 1
     
@@ -401,12 +588,10 @@ def _calculate_property_score(property_data: Dict[str, Any]) -> float:
         climate = property_data["climate_data"]
         precipitation = climate.get('ANNUAL_PRECIPITATION_INCHES', 0)
         if precipitation:
-            # Convert to float to handle Decimal types from Snowflake
-            precipitation_float = float(precipitation) if precipitation is not None else 0.0
             # Optimal precipitation range for most crops is 20-40 inches
-            if 20 <= precipitation_float <= 40:
+            if 20 <= precipitation <= 40:
                 score += 85.0
-            elif 15 <= precipitation_float <= 50:
+            elif 15 <= precipitation <= 50:
                 score += 70.0
             else:
                 score += 55.0
@@ -416,10 +601,9 @@ def _calculate_property_score(property_data: Dict[str, Any]) -> float:
 
 
 @router.get("/portfolio/{user_id}", response_model=schemas.PortfolioAnalysis)
-async def get_portfolio_analysis(
+def get_portfolio_analysis(
     user_id: str,
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(get_current_active_user)
 ):
     """Get portfolio analysis for a user's properties"""
     try:
@@ -453,30 +637,114 @@ async def get_portfolio_analysis(
         )
 
 
+_COMPARE_SYSTEM_PROMPT = """You are an expert agricultural and land analysis consultant.
+        You will receive data for several properties, each introduced by a
+        === PROPERTY <property_id> === header followed by that property's
+        data as compact JSON keyed by data source. Compare them and respond with a
+        single JSON object. For each property_id include a key holding an object
+        with "strengths" (list), "weaknesses" (list), "best_use" (string) and
+        "overall_rating" (number 0-100). Add one extra key "recommendations"
+        holding a list of cross-property recommendations (e.g. which property to
+        prioritize and why). Return only the JSON object, no other text."""
+
+
 @router.post("/compare", response_model=schemas.PropertyComparisonResponse)
 async def compare_properties(
     request: schemas.PropertyComparisonRequest,
-    current_user = Depends(get_optional_current_user()),
-    db: Session = Depends(get_db)
+    current_user = Depends(get_optional_current_user)
 ):
     """Compare multiple properties"""
     try:
-        from api.core.config import settings
-        
-        # TODO: Implement property comparison
+        snowflake_conn = get_snowflake_connector()
+
+        # Fetch every property's data concurrently (bounded so huge requests
+        # don't exhaust the Snowflake pool) and pipeline the CPU work: each
+        # property's summary and score are computed the moment its gather
+        # lands, overlapping with the gathers still in flight. A failed
+        # property is dropped from the comparison rather than failing the
+        # whole request.
+        semaphore = asyncio.Semaphore(10)
+
+        async def gather_one(pid: str):
+            try:
+                async with semaphore:
+                    data = await _gather_comprehensive_property_data(snowflake_conn, pid)
+            except Exception as e:
+                logger.error(f"Error gathering data for {pid}: {e}")
+                return pid, None, None, None
+            if not data:
+                return pid, None, None, None
+            return pid, data, _prepare_data_summary_for_llm(data), _calculate_property_score(data)
+
+        tasks = [asyncio.create_task(gather_one(pid)) for pid in request.property_ids]
+        property_data, summaries, scores = {}, {}, {}
+        for fut in asyncio.as_completed(tasks):
+            pid, data, summary, score = await fut
+            if data:
+                property_data[pid] = data
+                summaries[pid] = summary
+                scores[pid] = score
+
+        if not property_data:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="None of the requested properties were found"
+            )
+
+        # Analyze all properties in one LLM call instead of one per property -
+        # every extra call would pay the full system prompt prefill again.
+        # Sections follow the requested order, not completion order.
+        sections = [
+            f"=== PROPERTY {pid} ===\n{summaries[pid]}"
+            for pid in request.property_ids if pid in property_data
+        ]
+        comparison_text, _ = await get_llm_service().generate_response(
+            conversation_history=[{
+                "role": "user",
+                "content": "Compare the following properties:\n\n" + "\n\n".join(sections)
+            }],
+            system_prompt=_COMPARE_SYSTEM_PROMPT
+        )
+
+        comparison_matrix = _parse_comparison_response(comparison_text)
+        recommendations = comparison_matrix.pop("recommendations", [])
+        if not isinstance(recommendations, list):
+            recommendations = [str(recommendations)]
+
         return schemas.PropertyComparisonResponse(
-            properties=[{"id": pid, "data": {}} for pid in request.property_ids],
-            comparison_matrix={
-                "acreage": [500, 750, 1000],
-                "soil_quality": [85, 78, 92],
-                "lease_value": [200, 180, 250]
-            },
-            recommendations=["Property 3 has the highest revenue potential"]
+            properties=[
+                {"id": pid, "data": {
+                    "overall_score": scores[pid],
+                    "available_data": list(data.keys())
+                }}
+                for pid, data in property_data.items()
+            ],
+            comparison_matrix=comparison_matrix,
+            recommendations=recommendations
         )
-        
+
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error comparing properties: {str(e)}", exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to compare properties"
         )
+
+
+def _parse_comparison_response(comparison_text: str) -> Dict[str, Any]:
+    """Parse the LLM's JSON comparison, tolerating markdown code fences"""
+    text = comparison_text.strip()
+    if text.startswith("```"):
+        text = text.strip("`")
+        if text.startswith("json"):
+            text = text[4:]
+    try:
+        parsed = orjson.loads(text)
+        if isinstance(parsed, dict):
+            return parsed
+    except orjson.JSONDecodeError:
+        pass
+    logger.warning("Comparison response was not valid JSON; returning raw analysis")
+    return {"analysis": comparison_text}
@@ -1,12 +1,18 @@
 """
 Recommendations endpoint for personalized property and optimization suggestions
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session, raiseload
+from operator import itemgetter
+from typing import Dict, List, Optional
+import asyncio
+import hashlib
 import logging
+import orjson
 
-from api.core.dependencies import get_db, cache, get_optional_current_user
+from api.core.dependencies import db_session, get_db, cache, get_optional_current_user
 from api.core.security import get_current_active_user
 from api.models import database as models
 from api.models import schemas
@@ -15,15 +21,60 @@ from services.crop_recommendation_service import CropRecommendationService
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
-# Initialize crop recommendation service
-crop_service = CropRecommendationService()
+# Crop recommendation service is initialized lazily so importing this module
+# (worker startup) doesn't pay for Snowflake/LLM client construction
+_crop_service = None
+
+
+def get_crop_service():
+    global _crop_service
+    if _crop_service is None:
+        _crop_service = CropRecommendationService()
+    return _crop_service
+
+
+def _cache_key(endpoint: str, *args) -> str:
+    """Cache key for a crop endpoint from its identifying arguments"""
+    return f"crop_recs:v1:{endpoint}:" + hashlib.sha256(orjson.dumps(args)).hexdigest()
+
+
+# In-flight recommendation builds keyed by cache key, so a cold-cache burst
+# on a popular parcel runs Snowflake/LLM work once and fans the result out
+_inflight: Dict[str, asyncio.Future] = {}
+
+# TODO: Implement ML-based property recommendations. The mock list is static,
+# so it is validated once at import time and the reference shared across
+# requests - only user_preferences varies per response
+_MOCK_RECOMMENDATIONS = [
+    schemas.PropertyRecommendation(
+        property_id="prop_456",
+        score=92.5,
+        reason="Matches your preferred acreage range and soil quality requirements",
+        property_details={
+            "address": "456 Farm Road, Austin, TX",
+            "acreage": 750,
+            "price": "$3,200,000"
+        },
+        match_factors=["Location", "Soil Quality", "Price Range", "Water Access"]
+    ),
+    schemas.PropertyRecommendation(
+        property_id="prop_789",
+        score=88.0,
+        reason="Excellent crop production history in your preferred region",
+        property_details={
+            "address": "789 Ranch Lane, Houston, TX",
+            "acreage": 1200,
+            "price": "$4,500,000"
+        },
+        match_factors=["Crop History", "Region", "Size"]
+    )
+]
 
 
 @router.get("/properties/{user_id}", response_model=schemas.RecommendationResponse)
 async def get_property_recommendations(
     user_id: str,
-    current_user: models.User = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    current_user: models.User = Depends(get_current_active_user)
 ):
     """Get personalized property recommendations for a user"""
     try:
@@ -33,40 +84,22 @@ async def get_property_recommendations(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not authorized to view these recommendations"
             )
-        
-        # TODO: Implement ML-based property recommendations
-        mock_recommendations = [
-            schemas.PropertyRecommendation(
-                property_id="prop_456",
-                score=92.5,
-                reason="Matches your preferred acreage range and soil quality requirements",
-                property_details={
-                    "address": "456 Farm Road, Austin, TX",
-                    "acreage": 750,
-                    "price": "$3,200,000"
-                },
-                match_factors=["Location", "Soil Quality", "Price Range", "Water Access"]
-            ),
-            schemas.PropertyRecommendation(
-                property_id="prop_789",
-                score=88.0,
-                reason="Excellent crop production history in your preferred region",
-                property_details={
-                    "address": "789 Ranch Lane, Houston, TX",
-                    "acreage": 1200,
-                    "price": "$4,500,000"
-                },
-                match_factors=["Crop History", "Region", "Size"]
-            )
-        ]
-        
-        # Get user preferences
-        user_prefs = db.query(models.UserPreference).filter(
-            models.UserPreference.user_id == user_id
-        ).first()
-        
+
+        # Preferences were eager-loaded with the authenticated user; only the
+        # admin-viewing-another-user path needs its own query, so the session
+        # is opened there rather than per-request via Depends
+        if str(current_user.id) == user_id:
+            user_prefs = current_user.preferences
+        else:
+            with db_session() as db:
+                user_prefs = db.execute(
+                    select(models.UserPreference)
+                    .options(raiseload("*"))
+                    .where(models.UserPreference.user_id == user_id)
+                ).scalar_one_or_none()
+
         return schemas.RecommendationResponse(
-            recommendations=mock_recommendations,
+            recommendations=_MOCK_RECOMMENDATIONS,
             user_preferences={
                 "preferred_crops": user_prefs.preferred_crops if user_prefs else [],
                 "preferred_locations": user_prefs.preferred_locations if user_prefs else [],
@@ -80,236 +113,326 @@ async def get_property_recommendations(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting property recommendations: {str(e)}", exc_info=True)
+        logger.error("Error getting property recommendations: %s", e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve property recommendations"
         )
 
 
-@router.get("/crops/{parcel_id}", response_model=schemas.BaseResponse)
+@router.get("/crops/{parcel_id}", responses={200: {"model": schemas.BaseResponse}})
 async def get_crop_recommendations(
     parcel_id: str,
     county_id: Optional[str] = Query(None, description="County ID for regional analysis"),
     state_code: Optional[str] = Query(None, description="State code for regional analysis"),
     include_ai_analysis: bool = Query(False, description="Include AI-enhanced analysis"),
-    current_user = Depends(get_optional_current_user()),
+    current_user = Depends(get_optional_current_user),
     db: Session = Depends(get_db)
 ):
     """Get intelligent crop recommendations based on historical data and analysis"""
     try:
-        from api.core.config import settings
-        
-        # Generate crop recommendations using the service
-        recommendations = await crop_service.generate_crop_recommendations(
-            parcel_id=parcel_id,
-            county_id=county_id,
-            state_code=state_code
-        )
-        
-        if not recommendations:
-            return schemas.BaseResponse(
-                success=True,
-                message="No specific recommendations available for this parcel",
-                metadata={
-                    "parcel_id": parcel_id,
-                    "recommendations": [],
-                    "note": "Consider providing county_id and state_code for better recommendations"
-                }
+        # Same inputs give the same recommendations at daily granularity,
+        # so repeat calls skip the Snowflake (and optional LLM) work
+        key = _cache_key("crops", parcel_id, county_id, state_code, include_ai_analysis)
+        cached = await cache.get(key)
+        if cached:
+            return Response(content=cached, media_type="application/json")
+
+        # Cold cache: if another request is already building this key,
+        # await its result instead of duplicating the upstream work
+        inflight = _inflight.get(key)
+        if inflight is not None:
+            body = await inflight
+            return Response(content=body, media_type="application/json")
+
+        fut: asyncio.Future = asyncio.get_running_loop().create_future()
+        fut.add_done_callback(lambda f: f.cancelled() or f.exception())
+        _inflight[key] = fut
+        try:
+            body = await _build_crop_recommendations(
+                parcel_id, county_id, state_code, include_ai_analysis, key
             )
-        
+            fut.set_result(body)
+        except BaseException as exc:
+            fut.set_exception(exc)
+            raise
+        finally:
+            _inflight.pop(key, None)
+
+        return Response(content=body, media_type="application/json")
+
+    except Exception as e:
+        logger.error("Error getting crop recommendations for parcel %s: %s", parcel_id, e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve crop recommendations"
+        )
+
+
+async def _build_crop_recommendations(
+    parcel_id: str,
+    county_id: Optional[str],
+    state_code: Optional[str],
+    include_ai_analysis: bool,
+    key: str
+) -> bytes:
+    """Generate, serialize and cache crop recommendations for one key"""
+    recommendations = await get_crop_service().generate_crop_recommendations(
+        parcel_id=parcel_id,
+        county_id=county_id,
+        state_code=state_code
+    )
+
+    if not recommendations:
+        payload = {
+            "success": True,
+            "message": "No specific recommendations available for this parcel",
+            "metadata": {
+                "parcel_id": parcel_id,
+                "recommendations": [],
+                "note": "Consider providing county_id and state_code for better recommendations"
+            }
+        }
+    else:
         # Get AI-enhanced analysis if requested
         response_data = {
             "parcel_id": parcel_id,
             "total_recommendations": len(recommendations),
             "recommendations": [rec.__dict__ for rec in recommendations]
         }
-        
+
         if include_ai_analysis:
-            ai_enhanced = await crop_service.get_ai_enhanced_recommendations(
+            ai_enhanced = await get_crop_service().get_ai_enhanced_recommendations(
                 parcel_id=parcel_id,
                 recommendations=recommendations
             )
             response_data.update(ai_enhanced)
-        
-        return schemas.BaseResponse(
-            success=True,
-            message=f"Generated {len(recommendations)} intelligent crop recommendations",
-            metadata=response_data
-        )
-        
-    except Exception as e:
-        logger.error(f"Error getting crop recommendations for parcel {parcel_id}: {str(e)}", exc_info=True)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve crop recommendations"
-        )
+
+        payload = {
+            "success": True,
+            "message": f"Generated {len(recommendations)} intelligent crop recommendations",
+            "metadata": response_data
+        }
+
+    body = orjson.dumps(payload, default=str)
+    await cache.set(key, body, ttl=21600)  # 6h
+    return body
+
+
+def _history_record_dict(record) -> Dict:
+    """Wire shape for one crop history record"""
+    return {
+        "history_id": record.history_id,
+        "crop_year": record.crop_year,
+        "crop_type": record.crop_type,
+        "rotation_sequence": record.rotation_sequence,
+        "county_id": record.county_id,
+        "state_code": record.state_code,
+        "created_at": record.created_at  # orjson handles datetimes
+    }
 
 
-@router.get("/crops/{parcel_id}/history", response_model=schemas.BaseResponse)
+@router.get("/crops/{parcel_id}/history", responses={200: {"model": schemas.BaseResponse}})
 async def get_crop_history(
     parcel_id: str,
     years: int = Query(5, description="Number of years of history to retrieve"),
-    current_user = Depends(get_optional_current_user()),
+    format: Optional[str] = Query(None, description="Set to 'ndjson' to stream one record per line"),
+    current_user = Depends(get_optional_current_user),
     db: Session = Depends(get_db)
 ):
     """Get crop history for a specific parcel"""
+    if format not in (None, "ndjson"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="format must be 'ndjson' when provided"
+        )
     try:
-        from api.core.config import settings
-        
+        # NDJSON export path: one line per record, serialized as it is sent
+        # so export clients start processing at row 1 instead of waiting for
+        # (and buffering) the whole envelope. Not cached - exports are rare
+        # and the cache stores the JSON envelope shape
+        if format == "ndjson":
+            crop_history = await get_crop_service().get_crop_history_for_parcel(parcel_id, years)
+
+            async def record_lines():
+                for record in crop_history:
+                    yield orjson.dumps(_history_record_dict(record), default=str) + b"\n"
+
+            return StreamingResponse(record_lines(), media_type="application/x-ndjson")
+
+        # History only grows yearly - serve repeats from cache for a day
+        key = _cache_key("history", parcel_id, years)
+        cached = await cache.get(key)
+        if cached:
+            return Response(content=cached, media_type="application/json")
+
         # Get crop history
-        crop_history = await crop_service.get_crop_history_for_parcel(parcel_id, years)
-        
+        crop_history = await get_crop_service().get_crop_history_for_parcel(parcel_id, years)
+
         if not crop_history:
-            return schemas.BaseResponse(
-                success=True,
-                message="No crop history found for this parcel",
-                metadata={
+            payload = {
+                "success": True,
+                "message": "No crop history found for this parcel",
+                "metadata": {
                     "parcel_id": parcel_id,
                     "years_requested": years,
                     "history": []
                 }
-            )
-        
-        # Analyze rotation patterns
-        rotation_analysis = crop_service.analyze_rotation_patterns(crop_history)
-        
-        # Format history data
-        history_data = []
-        for record in crop_history:
-            history_data.append({
-                "history_id": record.history_id,
-                "crop_year": record.crop_year,
-                "crop_type": record.crop_type,
-                "rotation_sequence": record.rotation_sequence,
-                "county_id": record.county_id,
-                "state_code": record.state_code,
-                "created_at": record.created_at.isoformat() if record.created_at else None
-            })
-        
-        return schemas.BaseResponse(
-            success=True,
-            message=f"Retrieved {len(crop_history)} crop history records",
-            metadata={
-                "parcel_id": parcel_id,
-                "years_requested": years,
-                "total_records": len(crop_history),
-                "history": history_data,
-                "rotation_analysis": rotation_analysis
             }
-        )
-        
+        else:
+            # Analyze rotation patterns
+            rotation_analysis = get_crop_service().analyze_rotation_patterns(crop_history)
+
+            # Format history data; one dict per record, serialized in a
+            # single orjson pass below (no Pydantic re-validation)
+            history_data = [_history_record_dict(record) for record in crop_history]
+
+            payload = {
+                "success": True,
+                "message": f"Retrieved {len(crop_history)} crop history records",
+                "metadata": {
+                    "parcel_id": parcel_id,
+                    "years_requested": years,
+                    "total_records": len(crop_history),
+                    "history": history_data,
+                    "rotation_analysis": rotation_analysis
+                }
+            }
+
+        body = orjson.dumps(payload, default=str)
+        await cache.set(key, body, ttl=86400)  # 24h
+        return Response(content=body, media_type="application/json")
+
     except Exception as e:
-        logger.error(f"Error getting crop history for parcel {parcel_id}: {str(e)}", exc_info=True)
+        logger.error("Error getting crop history for parcel %s: %s", parcel_id, e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve crop history"
         )
 
 
-@router.get("/crops/regional/{county_id}/{state_code}", response_model=schemas.BaseResponse)
+@router.get("/crops/regional/{county_id}/{state_code}", responses={200: {"model": schemas.BaseResponse}})
 async def get_regional_crop_performance(
     county_id: str,
     state_code: str,
     years: int = Query(3, description="Number of years for regional analysis"),
-    current_user = Depends(get_optional_current_user()),
+    current_user = Depends(get_optional_current_user),
     db: Session = Depends(get_db)
 ):
     """Get regional crop performance data"""
     try:
-        from api.core.config import settings
-        
+        # Regional aggregates are shared across every parcel in the county,
+        # so this cache has a high hit rate
+        key = _cache_key("regional", county_id, state_code, years)
+        cached = await cache.get(key)
+        if cached:
+            return Response(content=cached, media_type="application/json")
+
         # Get regional performance data
-        regional_data = await crop_service.get_regional_crop_performance(county_id, state_code, years)
-        
+        regional_data = await get_crop_service().get_regional_crop_performance(county_id, state_code, years)
+
         if not regional_data:
-            return schemas.BaseResponse(
-                success=True,
-                message="No regional crop data found",
-                metadata={
+            payload = {
+                "success": True,
+                "message": "No regional crop data found",
+                "metadata": {
                     "county_id": county_id,
                     "state_code": state_code,
                     "years_analyzed": years,
                     "regional_data": {}
                 }
-            )
-        
-        # Calculate summary statistics
-        total_frequency = sum(data["frequency"] for data in regional_data.values())
-        most_popular_crop = max(regional_data.items(), key=lambda x: x[1]["frequency"])
-        
-        return schemas.BaseResponse(
-            success=True,
-            message=f"Retrieved regional crop performance for {county_id}, {state_code}",
-            metadata={
-                "county_id": county_id,
-                "state_code": state_code,
-                "years_analyzed": years,
-                "total_crop_instances": total_frequency,
-                "crop_types_found": len(regional_data),
-                "most_popular_crop": {
-                    "crop_type": most_popular_crop[0],
-                    "frequency": most_popular_crop[1]["frequency"]
-                },
-                "regional_data": regional_data
             }
-        )
-        
+        else:
+            # Calculate summary statistics; extract frequencies once instead
+            # of re-walking the nested dicts per aggregate
+            frequencies = [(crop, data["frequency"]) for crop, data in regional_data.items()]
+            total_frequency = sum(freq for _, freq in frequencies)
+            most_popular_crop = max(frequencies, key=itemgetter(1))
+
+            payload = {
+                "success": True,
+                "message": f"Retrieved regional crop performance for {county_id}, {state_code}",
+                "metadata": {
+                    "county_id": county_id,
+                    "state_code": state_code,
+                    "years_analyzed": years,
+                    "total_crop_instances": total_frequency,
+                    "crop_types_found": len(regional_data),
+                    "most_popular_crop": {
+                        "crop_type": most_popular_crop[0],
+                        "frequency": most_popular_crop[1]["frequency"]
+                    },
+                    "regional_data": regional_data
+                }
+            }
+
+        body = orjson.dumps(payload, default=str)
+        await cache.set(key, body, ttl=43200)  # 12h
+        return Response(content=body, media_type="application/json")
+
     except Exception as e:
-        logger.error(f"Error getting regional crop performance: {str(e)}", exc_info=True)
+        logger.error("Error getting regional crop performance: %s", e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve regional crop performance"
         )
 
 
-@router.get("/revenue/{property_id}", response_model=schemas.BaseResponse)
+# TODO: Implement revenue optimization analysis. Until then the strategies
+# are static, so they live at module scope and each response skips Pydantic
+# validation entirely - only property_id varies per request
+_REVENUE_OPTIMIZATIONS = [
+    {
+        "strategy": "Agricultural Lease",
+        "potential_revenue": "$150,000/year",
+        "implementation": "Partner with local farmers for crop production",
+        "timeline": "3-6 months",
+        "requirements": ["Soil testing", "Lease agreement", "Insurance"]
+    },
+    {
+        "strategy": "Section 180 Tax Deduction",
+        "potential_savings": "$50,000-$75,000",
+        "implementation": "Conduct soil conservation improvements",
+        "timeline": "6-12 months",
+        "requirements": ["Soil analysis", "Conservation plan", "Tax advisor consultation"]
+    },
+    {
+        "strategy": "Hunting Lease",
+        "potential_revenue": "$25,000/year",
+        "implementation": "Develop hunting infrastructure and partnerships",
+        "timeline": "2-3 months",
+        "requirements": ["Wildlife survey", "Insurance", "Access roads"]
+    }
+]
+
+_REVENUE_MESSAGE = f"Generated {len(_REVENUE_OPTIMIZATIONS)} revenue optimization strategies"
+
+
+@router.get("/revenue/{property_id}", responses={200: {"model": schemas.BaseResponse}})
 async def get_revenue_optimization(
     property_id: str,
-    current_user = Depends(get_optional_current_user()),
+    current_user = Depends(get_optional_current_user),
     db: Session = Depends(get_db)
 ):
     """Get revenue optimization recommendations for a property"""
     try:
-        from api.core.config import settings
-        
-        # TODO: Implement revenue optimization analysis
-        optimizations = [
-            {
-                "strategy": "Agricultural Lease",
-                "potential_revenue": "$150,000/year",
-                "implementation": "Partner with local farmers for crop production",
-                "timeline": "3-6 months",
-                "requirements": ["Soil testing", "Lease agreement", "Insurance"]
-            },
-            {
-                "strategy": "Section 180 Tax Deduction",
-                "potential_savings": "$50,000-$75,000",
-                "implementation": "Conduct soil conservation improvements",
-                "timeline": "6-12 months",
-                "requirements": ["Soil analysis", "Conservation plan", "Tax advisor consultation"]
-            },
-            {
-                "strategy": "Hunting Lease",
-                "potential_revenue": "$25,000/year",
-                "implementation": "Develop hunting infrastructure and partnerships",
-                "timeline": "2-3 months",
-                "requirements": ["Wildlife survey", "Insurance", "Access roads"]
-            }
-        ]
-        
-        return schemas.BaseResponse(
-            success=True,
-            message=f"Generated {len(optimizations)} revenue optimization strategies",
-            metadata={
+        return ORJSONResponse({
+            "success": True,
+            "message": _REVENUE_MESSAGE,
+            "metadata": {
                 "property_id": property_id,
                 "total_potential_revenue": "$225,000/year",
-                "optimizations": optimizations
+                "optimizations": _REVENUE_OPTIMIZATIONS
             }
-        )
-        
+        })
+
     except Exception as e:
-        logger.error(f"Error getting revenue optimization: {str(e)}", exc_info=True)
+        logger.error("Error getting revenue optimization: %s", e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve revenue optimization recommendations"
@@ -1,12 +1,13 @@
 """
 Search endpoint for semantic property and insight search
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 
-from api.core.dependencies import get_db, cache, get_optional_current_user
+from api.core.config import settings
+from api.core.dependencies import SessionLocal, get_db, cache, get_optional_current_user
 from api.core.security import get_current_active_user
 from api.models import database as models
 from api.models import schemas
@@ -33,26 +34,46 @@ def get_search_service():
     return _search_service
 
 
+def _persist_search_history(
+    user_id,
+    search_type: str,
+    query: str,
+    filters: Optional[Dict[str, Any]],
+    results_count: int
+):
+    """Write one SearchHistory row after the response has been sent.
+
+    Runs as a background task with its own session, so the insert and
+    commit stay off the request path and results_count is known up front -
+    one round-trip instead of add-then-update.
+    """
+    db = SessionLocal()
+    try:
+        db.add(models.SearchHistory(
+            user_id=user_id,
+            search_type=search_type,
+            query=query,
+            filters=filters or {},
+            results_count=results_count
+        ))
+        db.commit()
+    except Exception as e:
+        logger.error("Error persisting search history: %s", e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
+        db.rollback()
+    finally:
+        db.close()
+
+
 @router.post("/properties", response_model=schemas.PropertySearchResponse)
 async def search_properties(
     request: schemas.PropertySearchRequest,
-    current_user = Depends(get_optional_current_user()),
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_optional_current_user),
     db: Session = Depends(get_db)
 ):
     """Semantic search for properties"""
     try:
-        from api.core.config import settings
-        
-        # Log search history (only if authentication is enabled)
-        if settings.ENABLE_AUTHENTICATION and current_user:
-            search_history = models.SearchHistory(
-                user_id=current_user.id,
-                search_type="property",
-                query=request.query,
-                filters=request.filters or {}
-            )
-            db.add(search_history)
-        
         # Perform search
         results = await get_search_service().search_properties(
             query=request.query,
@@ -62,12 +83,19 @@ async def search_properties(
             limit=request.limit,
             offset=request.offset
         )
-        
-        # Update search history with results count (only if authentication is enabled)
+
+        # Log search history after the response is sent (only if
+        # authentication is enabled)
         if settings.ENABLE_AUTHENTICATION and current_user:
-            search_history.results_count = len(results)
-            db.commit()
-        
+            background_tasks.add_task(
+                _persist_search_history,
+                current_user.id,
+                "property",
+                request.query,
+                request.filters,
+                len(results)
+            )
+
         return schemas.PropertySearchResponse(
             results=results,
             total_count=len(results),  # TODO: Get actual total from search service
@@ -75,7 +103,8 @@ async def search_properties(
         )
         
     except Exception as e:
-        logger.error(f"Error in property search: {str(e)}", exc_info=True)
+        logger.error("Error in property search: %s", e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to search properties"
@@ -85,42 +114,39 @@ async def search_properties(
 @router.post("/insights", response_model=schemas.BaseResponse)
 async def search_insights(
     request: schemas.InsightSearchRequest,
-    current_user = Depends(get_optional_current_user()),
+    background_tasks: BackgroundTasks,
+    current_user = Depends(get_optional_current_user),
     db: Session = Depends(get_db)
 ):
     """Search for agricultural insights"""
     try:
-        from api.core.config import settings
-        
-        # Log search history (only if authentication is enabled)
+        # TODO: Implement insight search
+        results = []
+
+        # Log search history after the response is sent (only if
+        # authentication is enabled)
         if settings.ENABLE_AUTHENTICATION and current_user:
-            search_history = models.SearchHistory(
-                user_id=current_user.id,
-                search_type="insight",
-                query=request.query,
-                filters={
+            background_tasks.add_task(
+                _persist_search_history,
+                current_user.id,
+                "insight",
+                request.query,
+                {
                     "insight_types": request.insight_types,
                     "property_ids": request.property_ids,
                     "date_range": request.date_range
-                }
+                },
+                len(results)
             )
-            db.add(search_history)
-        
-        # TODO: Implement insight search
-        results = []
-        
-        # Update search history with results count (only if authentication is enabled)
-        if settings.ENABLE_AUTHENTICATION and current_user:
-            search_history.results_count = len(results)
-            db.commit()
-        
+
         return schemas.BaseResponse(
             success=True,
             message=f"Found {len(results)} insights"
         )
         
     except Exception as e:
-        logger.error(f"Error in insight search: {str(e)}", exc_info=True)
+        logger.error("Error in insight search: %s", e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to search insights"
@@ -131,12 +157,11 @@ async def search_insights(
 async def get_search_suggestions(
     query: str,
     search_type: str = "property",
-    current_user = Depends(get_optional_current_user()),
+    current_user = Depends(get_optional_current_user),
     db: Session = Depends(get_db)
 ):
     """Get search suggestions based on partial query"""
     try:
-        from api.core.config import settings
         
         # TODO: Implement search suggestions
         suggestions = [
@@ -152,7 +177,8 @@ async def get_search_suggestions(
         )
         
     except Exception as e:
-        logger.error(f"Error getting search suggestions: {str(e)}", exc_info=True)
+        logger.error("Error getting search suggestions: %s", e,
+                     exc_info=logger.isEnabledFor(logging.DEBUG))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to get search suggestions"
@@ -7,6 +7,18 @@ from api.models import database as models
 
 router = APIRouter()
 
+# One client reused across requests - construction builds an httpx pool
+_openai_client = None
+
+
+def _get_openai_client():
+    global _openai_client
+    if _openai_client is None:
+        from openai import AsyncOpenAI
+        from api.core.config import settings
+        _openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
+    return _openai_client
+
 @router.get("/test")
 async def test_endpoint(
     current_user: models.User = Depends(get_current_active_user)
@@ -27,12 +39,10 @@ async def test_openai(
 ):
     """Test OpenAI connection"""
     try:
-        from openai import OpenAI
-        from api.core.config import settings
-        
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-        
-        response = client.chat.completions.create(
+        # Async client so the round trip doesn't block the event loop
+        client = _get_openai_client()
+
+        response = await client.chat.completions.create(
             model="gpt-3.5-turbo",
             messages=[
                 {"role": "system", "content": "You are a helpful assistant."},
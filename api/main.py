@@ -1,15 +1,30 @@
 """
 Main FastAPI application for Teddy AI Service
 """
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware
 from contextlib import asynccontextmanager
+import asyncio
+import functools
+import hashlib
 import logging
-from prometheus_client import make_asgi_app
+import fastapi.dependencies.utils as _fastapi_dep_utils
+from prometheus_client import start_http_server
 
 from api.core.config import settings
-from api.core.dependencies import Base, engine
+
+# Shared dependencies (get_db, the auth deps, rate limiter) are re-inspected
+# by FastAPI for every route that uses them while the routers below register.
+# Memoizing the typed-signature helper makes that inspection run once per
+# callable instead of once per route; results depend only on the callable,
+# so caching is safe
+_fastapi_dep_utils.get_typed_signature = functools.lru_cache(maxsize=None)(
+    _fastapi_dep_utils.get_typed_signature
+)
+from api.core.dependencies import Base, engine, redis_client, redis_pool
 from api.endpoints import auth, chat, search, insights, recommendations, test
 from api.models.schemas import HealthResponse, ErrorResponse
 
@@ -26,10 +41,27 @@ async def lifespan(app: FastAPI):
     """Handle startup and shutdown events"""
     # Startup
     logger.info("Starting Teddy AI Service...")
-    
-    # Create database tables
-    Base.metadata.create_all(bind=engine)
-    logger.info("Database tables created/verified")
+
+    # Create database tables (dev convenience; production schemas are
+    # managed by migrations). Off-thread so the sync driver's per-table
+    # existence checks don't block the loop during startup
+    if settings.AUTO_CREATE_TABLES:
+        await asyncio.to_thread(Base.metadata.create_all, bind=engine)
+        logger.info("Database tables created/verified")
+
+    # Serve Prometheus metrics from a dedicated thread on its own port so
+    # scrapes never compete with request traffic for the event loop
+    if settings.ENABLE_METRICS:
+        start_http_server(settings.METRICS_PORT)
+        logger.info(f"Metrics server listening on port {settings.METRICS_PORT}")
+
+    # Verify Redis connectivity (non-fatal - caching degrades gracefully)
+    if redis_client is not None:
+        try:
+            await redis_client.ping()
+            logger.info("Redis connection verified")
+        except Exception:
+            logger.warning("Redis unreachable at startup; caching and rate limiting disabled")
     
     # Initialize services
     # TODO: Initialize ML models, vector store, etc.
@@ -38,6 +70,12 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down Teddy AI Service...")
+    if redis_client is not None:
+        try:
+            await redis_client.close()
+            await redis_pool.disconnect()
+        except Exception:
+            logger.warning("Error closing Redis connections at shutdown")
     # TODO: Cleanup resources
 
 
@@ -47,9 +85,57 @@ app = FastAPI(
     version="1.0.0",
     description="AI-powered land intelligence platform for BirdDog",
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
+class ETagMiddleware(BaseHTTPMiddleware):
+    """Conditional-request support for idempotent GETs.
+
+    Hashes each successful GET body into a weak ETag and answers
+    If-None-Match revalidations with an empty 304, so polling clients
+    (dashboards) stop re-downloading unchanged payloads. Streams are left
+    untouched, as are endpoints that already set their own ETag.
+    """
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+
+        if request.method != "GET" or response.status_code != 200:
+            return response
+        # Streaming bodies (SSE, NDJSON exports) carry no content-length;
+        # hashing them would mean buffering the whole stream, so pass them
+        # through chunk-by-chunk
+        if "content-length" not in response.headers:
+            return response
+
+        etag = response.headers.get("etag")
+        if etag is None:
+            # Buffer the body to hash it; GET payloads here are bounded
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+            headers = dict(response.headers)
+            headers["etag"] = etag
+            response = Response(
+                content=body,
+                status_code=response.status_code,
+                headers=headers,
+                media_type=response.media_type,
+            )
+
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"etag": etag})
+        return response
+
+
+app.add_middleware(ETagMiddleware)
+
+# Compress sizeable JSON bodies (crop history, regional data, insights).
+# Runs outside the ETag middleware, so ETags hash the uncompressed body and
+# stay stable across Accept-Encoding variants. Level 5 is near-max ratio at
+# a fraction of level 9's CPU; tiny payloads are skipped
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
 # Configure CORS
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -60,12 +146,6 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
-# Mount Prometheus metrics
-if settings.ENABLE_METRICS:
-    metrics_app = make_asgi_app()
-    app.mount("/metrics", metrics_app)
-
-
 # Exception handlers
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
@@ -73,9 +153,10 @@ async def value_error_handler(request: Request, exc: ValueError):
         error=str(exc),
         error_code="VALUE_ERROR"
     )
-    return JSONResponse(
+    # orjson handles datetimes natively, so no mode='json' pre-conversion
+    return ORJSONResponse(
         status_code=400,
-        content=error_response.model_dump(mode='json')
+        content=error_response.model_dump()
     )
 
 
@@ -86,9 +167,9 @@ async def general_exception_handler(request: Request, exc: Exception):
         error="An internal error occurred",
         error_code="INTERNAL_ERROR"
     )
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
-        content=error_response.model_dump(mode='json')
+        content=error_response.model_dump()
     )
 
 
@@ -2,8 +2,14 @@
 Snowflake Connector for accessing SSURGO soil data and Parcel data
 """
 import snowflake.connector
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
+import functools
 import logging
+import os
+import queue
+import time
+import orjson
 import pandas as pd
 from contextlib import contextmanager
 from cryptography.hazmat.backends import default_backend
@@ -14,7 +20,331 @@ from api.core.config import settings
 logger = logging.getLogger(__name__)
 
 
+def _rows_as_dicts(cursor) -> List[Dict[str, Any]]:
+    """Materialize all result rows as dicts, in bulk via Arrow when possible.
+
+    fetch_arrow_batches() downloads result batches concurrently and decodes
+    them in native code, so converting with to_pylist() is much cheaper than
+    a Python-level conversion per row - crop history alone can be hundreds
+    of rows. Converting per batch keeps peak memory at one batch plus the
+    output list instead of a second full-table copy. Falls back to
+    fetchall() - which already yields dicts, cursors here are DictCursor -
+    when the result set was not delivered in Arrow format (or pyarrow is
+    unavailable).
+    """
+    try:
+        rows: List[Dict[str, Any]] = []
+        for batch in cursor.fetch_arrow_batches():
+            rows.extend(batch.to_pylist())
+        return rows
+    except Exception as e:
+        logger.debug(f"Arrow fetch unavailable, falling back to fetchall: {e}")
+
+    return cursor.fetchall() or []
+
+
+# Recent single-row lookups keyed by (dataset, parcel_id). Parcel attributes
+# change on pipeline cadence, not per request, so a short TTL absorbs
+# dashboard re-renders without a Snowflake round trip. Cleared wholesale when
+# full, like the other in-process memos in this codebase
+_ROW_CACHE_MAX = 10_000
+_ROW_CACHE_TTL = 300.0  # seconds
+_row_cache: Dict[Tuple[str, str], Tuple[float, Optional[Dict[str, Any]]]] = {}
+
+
+# SQL lives in module constants so the exact same text is sent on every call.
+# Snowflake keys both its compile cache and its result cache on the literal
+# query string, so byte-identical SQL across calls (and across workers) means
+# plan reuse and result-cache hits for repeated lookups.
+
+_Q_BOUNDARIES = """
+SELECT
+    PARCEL_ID,
+    ADDRESS,
+    CITY,
+    STATE_CODE,
+    ZIP_CODE,
+    ACRES,
+    OWNER_NAME,
+    TOTAL_VALUE,
+    LAND_VALUE,
+    IMPROVEMENT_VALUE,
+    USECODE,
+    USEDESC,
+    ZONING,
+    ZONING_DESCRIPTION,
+    COUNTY_ID,
+    PARCEL_GEOJSON,
+    LATITUDE,
+    LONGITUDE
+FROM PARCEL_PROFILE
+WHERE PARCEL_ID = %s
+"""
+
+_Q_SOIL = """
+SELECT
+    sp.PARCEL_ID,
+    sp.MUKEY,
+    sp.MAP_UNIT_SYMBOL,
+    sp.COMPONENT_KEY,
+    sp.COMPONENT_PERCENTAGE,
+    sp.SOIL_SERIES,
+    sp.SOIL_TYPE,
+    sp.FERTILITY_CLASS,
+    sp.ORGANIC_MATTER_PCT,
+    sp.PH_LEVEL,
+    sp.CATION_EXCHANGE_CAPACITY,
+    sp.DRAINAGE_CLASS,
+    sp.HYDROLOGIC_GROUP,
+    sp.SLOPE_PERCENT,
+    sp.AVAILABLE_WATER_CAPACITY,
+    sp.NITROGEN_PPM,
+    sp.PHOSPHORUS_PPM,
+    sp.POTASSIUM_PPM,
+    sp.TAXONOMIC_CLASS,
+    sp.AGRICULTURAL_CAPABILITY,
+    sp.SAMPLING_DEPTH_CM,
+    sp.CONFIDENCE_SCORE,
+    sp.MATCH_QUALITY,
+    sp.DISTANCE_MILES,
+    pp.ADDRESS,
+    pp.CITY,
+    pp.STATE_CODE,
+    pp.ACRES,
+    pp.COUNTY_ID
+FROM SOIL_PROFILE sp
+JOIN PARCEL_PROFILE pp ON sp.PARCEL_ID = pp.PARCEL_ID
+WHERE sp.PARCEL_ID = %s
+ORDER BY sp.COMPONENT_PERCENTAGE DESC
+"""
+
+# Aggregated in the warehouse: one small JSON row per parcel instead of
+# every soil component row shipped over the wire. MAX_BY picks the dominant
+# component's attributes without a second scan
+_Q_SOIL_SUMMARY = """
+SELECT OBJECT_CONSTRUCT(
+    'parcel_id', PARCEL_ID,
+    'component_count', COUNT(*),
+    'avg_ph_level', AVG(PH_LEVEL),
+    'avg_organic_matter_pct', AVG(ORGANIC_MATTER_PCT),
+    'avg_slope_percent', AVG(SLOPE_PERCENT),
+    'total_component_percentage', SUM(COMPONENT_PERCENTAGE),
+    'dominant_soil_series', MAX_BY(SOIL_SERIES, COMPONENT_PERCENTAGE),
+    'dominant_soil_type', MAX_BY(SOIL_TYPE, COMPONENT_PERCENTAGE),
+    'dominant_fertility_class', MAX_BY(FERTILITY_CLASS, COMPONENT_PERCENTAGE),
+    'dominant_drainage_class', MAX_BY(DRAINAGE_CLASS, COMPONENT_PERCENTAGE),
+    'dominant_agricultural_capability', MAX_BY(AGRICULTURAL_CAPABILITY, COMPONENT_PERCENTAGE),
+    'dominant_component_percentage', MAX(COMPONENT_PERCENTAGE)
+) AS SOIL_SUMMARY
+FROM SOIL_PROFILE
+WHERE PARCEL_ID = %s
+GROUP BY PARCEL_ID
+"""
+
+# One canonical text regardless of which filters are set: NULL-safe
+# predicates replace a dynamically built WHERE clause, so every filter shape
+# compiles to the same cached plan
+_Q_SEARCH = """
+SELECT
+    PARCEL_ID,
+    ADDRESS,
+    CITY,
+    STATE_CODE,
+    COUNTY_ID,
+    ZIP_CODE,
+    ACRES,
+    OWNER_NAME,
+    TOTAL_VALUE,
+    USECODE,
+    USEDESC,
+    LATITUDE,
+    LONGITUDE
+FROM PARCEL_PROFILE
+WHERE (%(min_acreage)s IS NULL OR ACRES >= %(min_acreage)s)
+    AND (%(max_acreage)s IS NULL OR ACRES <= %(max_acreage)s)
+    AND (%(county)s IS NULL OR LOWER(COUNTY_ID) = LOWER(%(county)s))
+    AND (%(state)s IS NULL OR LOWER(STATE_CODE) = LOWER(%(state)s))
+    AND ACRES IS NOT NULL
+    AND LATITUDE IS NOT NULL
+    AND LONGITUDE IS NOT NULL
+LIMIT %(limit)s
+"""
+
+_Q_CROP_HISTORY = """
+SELECT
+    HISTORY_ID,
+    PARCEL_ID,
+    CROP_YEAR,
+    CROP_TYPE,
+    ROTATION_SEQUENCE,
+    CROP_GEOJSON,
+    COUNTY_ID,
+    STATE_CODE,
+    CREATED_AT,
+    UPDATED_AT
+FROM CROP_HISTORY
+WHERE PARCEL_ID = %s
+    AND CROP_YEAR >= YEAR(CURRENT_DATE) - %s
+ORDER BY CROP_YEAR DESC, ROTATION_SEQUENCE ASC
+"""
+
+_Q_COMPREHENSIVE = """
+SELECT
+    PARCEL_ID,
+    PARCEL_ACRES,
+    COUNTY_ID,
+    STATE_CODE,
+    ADDRESS,
+    OWNER_NAME,
+    USECODE,
+    USEDESC,
+    ZONING,
+    ZONING_DESCRIPTION,
+    HOMESTEAD_EXEMPTION,
+    TOTAL_VALUE,
+    LAND_VALUE,
+    IMPROVEMENT_VALUE,
+    TAXAMT,
+    SALEPRICE,
+    SALEDATE,
+    LAND_COVER_SUMMARY,
+    DOMINANT_COVER_TYPE,
+    DOMINANT_COVER_PERCENTAGE,
+    TOTAL_COVER_TYPES,
+    AGRICULTURAL_PERCENTAGE,
+    FOREST_PERCENTAGE,
+    DEVELOPED_PERCENTAGE,
+    CROP_SUMMARY,
+    DOMINANT_CROP,
+    TOTAL_AGRICULTURAL_CROPS,
+    AGRICULTURAL_CLASSIFICATION,
+    SECTION_180_POTENTIAL,
+    TAX_EXEMPTION_ANALYSIS,
+    VALUATION_FLAG,
+    INVESTMENT_OPPORTUNITY_FLAG
+FROM COMPREHENSIVE_PARCEL_CDL_ANALYSIS
+WHERE PARCEL_ID = %s
+"""
+
+_Q_CLIMATE = """
+SELECT
+    CLIMATE_ID,
+    PARCEL_ID,
+    COUNTY_ID,
+    STATE_CODE,
+    DATA_YEAR,
+    ANNUAL_PRECIPITATION_INCHES,
+    ANNUAL_PRECIPITATION_MM,
+    ANNUAL_SNOWFALL_INCHES,
+    GROWING_DEGREE_DAYS,
+    AVG_TEMPERATURE_F,
+    MAX_TEMPERATURE_F,
+    MIN_TEMPERATURE_F,
+    CLIMATE_CLASSIFICATION,
+    WEATHER_STATION_NAME,
+    STATION_DISTANCE_MILES,
+    YEARS_OF_DATA,
+    DATA_PERIOD,
+    IS_MULTI_YEAR_AVERAGE
+FROM CLIMATE_DATA
+WHERE PARCEL_ID = %s
+ORDER BY DATA_YEAR DESC
+LIMIT 1
+"""
+
+_Q_SECTION_180 = """
+SELECT
+    ESTIMATE_ID,
+    PARCEL_ID,
+    ESTIMATE_DATE,
+    TOTAL_DEDUCTION,
+    NITROGEN_VALUE,
+    PHOSPHORUS_VALUE,
+    POTASSIUM_VALUE,
+    CONFIDENCE_SCORE,
+    METHODOLOGY,
+    NOTES
+FROM SECTION_180_ESTIMATES
+WHERE PARCEL_ID = %s
+ORDER BY ESTIMATE_DATE DESC
+LIMIT 1
+"""
+
+_Q_TOPOGRAPHY = """
+SELECT
+    TOPO_ID,
+    PARCEL_ID,
+    MEAN_ELEVATION_FT,
+    MIN_ELEVATION_FT,
+    MAX_ELEVATION_FT,
+    ELEVATION_VARIANCE_FT,
+    SLOPE_PERCENT,
+    TERRAIN_ANALYSIS,
+    RESOLUTION,
+    COLLECTION_METHOD,
+    COLLECTION_DATE
+FROM TOPOGRAPHY
+WHERE PARCEL_ID = %s
+ORDER BY COLLECTION_DATE DESC
+LIMIT 1
+"""
+
+
+# The property-detail workflow needs all four single-row datasets at once.
+# Fusing them into one statement pays the round trip and query compile once
+# instead of four times; each scalar subquery keeps the same filter/ordering
+# as its standalone constant, and OBJECT_CONSTRUCT omits datasets with no row
+_Q_PROFILE = """
+SELECT OBJECT_CONSTRUCT(
+    'comprehensive_analysis', (
+        SELECT OBJECT_CONSTRUCT(*)
+        FROM COMPREHENSIVE_PARCEL_CDL_ANALYSIS
+        WHERE PARCEL_ID = %s
+    ),
+    'climate_data', (
+        SELECT OBJECT_CONSTRUCT(*)
+        FROM CLIMATE_DATA
+        WHERE PARCEL_ID = %s
+        ORDER BY DATA_YEAR DESC
+        LIMIT 1
+    ),
+    'section_180_estimates', (
+        SELECT OBJECT_CONSTRUCT(*)
+        FROM SECTION_180_ESTIMATES
+        WHERE PARCEL_ID = %s
+        ORDER BY ESTIMATE_DATE DESC
+        LIMIT 1
+    ),
+    'topography_data', (
+        SELECT OBJECT_CONSTRUCT(*)
+        FROM TOPOGRAPHY
+        WHERE PARCEL_ID = %s
+        ORDER BY COLLECTION_DATE DESC
+        LIMIT 1
+    )
+) AS PROFILE
+"""
+
+
+# Bulk variants fetch many parcels in one round trip instead of one query
+# per id. The IN list is the only varying part, so templates derive from the
+# single-row constants; ids are chunked to keep statements bounded
+_Q_BOUNDARIES_BULK = _Q_BOUNDARIES.replace(
+    "WHERE PARCEL_ID = %s", "WHERE PARCEL_ID IN ({placeholders})"
+)
+_Q_COMPREHENSIVE_BULK = _Q_COMPREHENSIVE.replace(
+    "WHERE PARCEL_ID = %s", "WHERE PARCEL_ID IN ({placeholders})"
+)
+_BULK_BATCH = 1000
+
+
 class SnowflakeConnector:
+    # Idle connections, shared across all connector instances in the process
+    # (every instance connects with the same settings). Borrowing an open
+    # session skips the connect handshake that otherwise dominates latency
+    # when several data methods run for one property
+    _pool: queue.Queue = queue.Queue(maxsize=settings.SNOWFLAKE_POOL_SIZE)
+
     def __init__(self):
         self.account = settings.SNOWFLAKE_ACCOUNT
         self.user = settings.SNOWFLAKE_USER
@@ -25,33 +355,44 @@ class SnowflakeConnector:
         self.warehouse = settings.SNOWFLAKE_WAREHOUSE
         self.role = settings.SNOWFLAKE_ROLE
         self._private_key = None
-        
+
         # Load private key if path is provided
         if self.private_key_path and not self.password:
             self._load_private_key()
-    
+
+    @staticmethod
+    @functools.lru_cache(maxsize=4)
+    def _load_der(path: str, mtime: float) -> bytes:
+        """Parse a PEM key file into DER bytes, cached by (path, mtime).
+
+        PEM parsing plus DER re-encoding costs tens of milliseconds, and
+        connectors are instantiated by several services; keying on mtime
+        means a rotated key file is picked up without a restart.
+        """
+        with open(path, "rb") as key_file:
+            private_key = serialization.load_pem_private_key(
+                key_file.read(),
+                password=None,
+                backend=default_backend()
+            )
+            return private_key.private_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption()
+            )
+
     def _load_private_key(self):
         """Load private key from file"""
         try:
-            with open(self.private_key_path, "rb") as key_file:
-                private_key = serialization.load_pem_private_key(
-                    key_file.read(),
-                    password=None,
-                    backend=default_backend()
-                )
-                self._private_key = private_key.private_bytes(
-                    encoding=serialization.Encoding.DER,
-                    format=serialization.PrivateFormat.PKCS8,
-                    encryption_algorithm=serialization.NoEncryption()
-                )
+            self._private_key = self._load_der(
+                self.private_key_path, os.stat(self.private_key_path).st_mtime
+            )
         except Exception as e:
             logger.error(f"Error loading private key: {str(e)}")
             raise
-    
-    @contextmanager
-    def get_connection(self):
-        """Get Snowflake connection context manager"""
-        conn = None
+
+    def _open_connection(self):
+        """Open a fresh Snowflake connection"""
         try:
             # Build connection parameters
             conn_params = {
@@ -60,9 +401,18 @@ class SnowflakeConnector:
                 "database": self.database,
                 "schema": self.schema,
                 "warehouse": self.warehouse,
-                "role": self.role
+                "role": self.role,
+                # Pooled sessions sit idle between requests; keep-alive stops
+                # the server from expiring them
+                "client_session_keep_alive": True,
+                # Large result sets (soil components, search pages) arrive as
+                # chunked downloads; doubling the prefetch threads overlaps
+                # more of that I/O, and the max chunk size amortizes the
+                # per-chunk request overhead over fewer, bigger transfers
+                "client_prefetch_threads": 8,
+                "session_parameters": {"CLIENT_RESULT_CHUNK_SIZE": 160},
             }
-            
+
             # Use private key if available, otherwise use password
             if self._private_key:
                 conn_params["private_key"] = self._private_key
@@ -70,401 +420,316 @@ class SnowflakeConnector:
                 conn_params["password"] = self.password
             else:
                 raise ValueError("Either password or private key must be provided")
-            
-            conn = snowflake.connector.connect(**conn_params)
-            yield conn
+
+            return snowflake.connector.connect(**conn_params)
         except Exception as e:
             logger.error(f"Error connecting to Snowflake: {str(e)}", exc_info=True)
             raise
-        finally:
-            if conn:
+
+    def _acquire(self):
+        """Take an open pooled connection, or open a new one"""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            if not conn.is_closed():
+                return conn
+        return self._open_connection()
+
+    @contextmanager
+    def get_connection(self):
+        """Get Snowflake connection context manager (pooled)"""
+        conn = self._acquire()
+        try:
+            yield conn
+        except Exception:
+            # The session may be mid-query or otherwise in an unknown state;
+            # drop it rather than returning it to the pool
+            try:
+                conn.close()
+            except Exception:
+                pass
+            raise
+        else:
+            try:
+                self._pool.put_nowait(conn)
+            except queue.Full:
                 conn.close()
-    
+
+    @staticmethod
+    def _cursor_for(conn):
+        """One reusable cursor per pooled connection.
+
+        Snowflake cursors are reusable once a fetch completes, and a pooled
+        connection is only ever borrowed by one thread at a time, so caching
+        the cursor on the connection skips per-query cursor construction.
+        DictCursor makes the driver hand rows back as dicts directly, so no
+        method needs its own column-name/row zip.
+        """
+        cursor = getattr(conn, "_cached_cursor", None)
+        if cursor is None:
+            cursor = conn.cursor(snowflake.connector.DictCursor)
+            conn._cached_cursor = cursor
+        return cursor
+
+    # The driver is synchronous, so query work runs in worker threads via
+    # asyncio.to_thread. That keeps the event loop free and lets callers that
+    # gather several of these methods (property insights, crop service) truly
+    # overlap the round trips instead of serializing on the loop.
+
+    async def _query_one(self, query: str, params) -> Optional[Dict[str, Any]]:
+        """Run a query off-thread and return the first row as a dict"""
+        def work():
+            with self.get_connection() as conn:
+                cursor = self._cursor_for(conn)
+                cursor.execute(query, params)
+                return cursor.fetchone()
+
+        return await asyncio.to_thread(work)
+
+    async def _query_all(self, query: str, params) -> List[Dict[str, Any]]:
+        """Run a query off-thread and return all rows as dicts"""
+        def work():
+            with self.get_connection() as conn:
+                cursor = self._cursor_for(conn)
+                cursor.execute(query, params)
+                return _rows_as_dicts(cursor)
+
+        return await asyncio.to_thread(work)
+
+    async def _query_one_cached(
+        self, dataset: str, query: str, property_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """_query_one with a short in-process TTL cache per (dataset, parcel)"""
+        key = (dataset, property_id)
+        now = time.monotonic()
+        hit = _row_cache.get(key)
+        if hit is not None and now - hit[0] < _ROW_CACHE_TTL:
+            return hit[1]
+
+        row = await self._query_one(query, (property_id,))
+        if len(_row_cache) >= _ROW_CACHE_MAX:
+            _row_cache.clear()
+        _row_cache[key] = (now, row)
+        return row
+
+    async def _query_bulk(
+        self, query_template: str, property_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Fetch rows for many parcels in chunked IN queries, keyed by id"""
+        # Deduplicate while preserving order so batch SQL text stays stable
+        # for identical id sets
+        ids = list(dict.fromkeys(property_ids))
+        rows_by_id: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(ids), _BULK_BATCH):
+            batch = ids[start:start + _BULK_BATCH]
+            query = query_template.format(placeholders=", ".join(["%s"] * len(batch)))
+            for row in await self._query_all(query, batch):
+                rows_by_id[row["PARCEL_ID"]] = row
+        return rows_by_id
+
     async def get_property_boundaries(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get property boundaries from PARCEL_PROFILE table"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Query for property boundaries using actual schema
-                query = """
-                SELECT 
-                    PARCEL_ID,
-                    ADDRESS,
-                    CITY,
-                    STATE_CODE,
-                    ZIP_CODE,
-                    ACRES,
-                    OWNER_NAME,
-                    TOTAL_VALUE,
-                    LAND_VALUE,
-                    IMPROVEMENT_VALUE,
-                    USECODE,
-                    USEDESC,
-                    ZONING,
-                    ZONING_DESCRIPTION,
-                    COUNTY_ID,
-                    PARCEL_GEOJSON,
-                    LATITUDE,
-                    LONGITUDE
-                FROM PARCEL_PROFILE
-                WHERE PARCEL_ID = %s
-                """
-                
-                cursor.execute(query, (property_id,))
-                result = cursor.fetchone()
-                
-                if result:
-                    columns = [desc[0] for desc in cursor.description]
-                    return dict(zip(columns, result))
-                
-                return None
-                
+            return await self._query_one_cached("boundaries", _Q_BOUNDARIES, property_id)
         except Exception as e:
             logger.error(f"Error getting property boundaries: {str(e)}", exc_info=True)
             raise
-    
+
+    async def get_property_boundaries_bulk(
+        self, property_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get boundaries for many parcels in one query per 1000 ids.
+
+        Returns a dict keyed by PARCEL_ID; ids with no row are absent.
+        """
+        if not property_ids:
+            return {}
+        try:
+            return await self._query_bulk(_Q_BOUNDARIES_BULK, property_ids)
+        except Exception as e:
+            logger.error(f"Error getting property boundaries in bulk: {str(e)}", exc_info=True)
+            raise
+
     async def get_soil_data(self, property_id: str) -> List[Dict[str, Any]]:
         """Get soil data for a property from SOIL_PROFILE table"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Query for soil data using correct schema columns
-                query = """
-                SELECT 
-                    sp.PARCEL_ID,
-                    sp.MUKEY,
-                    sp.MAP_UNIT_SYMBOL,
-                    sp.COMPONENT_KEY,
-                    sp.COMPONENT_PERCENTAGE,
-                    sp.SOIL_SERIES,
-                    sp.SOIL_TYPE,
-                    sp.FERTILITY_CLASS,
-                    sp.ORGANIC_MATTER_PCT,
-                    sp.PH_LEVEL,
-                    sp.CATION_EXCHANGE_CAPACITY,
-                    sp.DRAINAGE_CLASS,
-                    sp.HYDROLOGIC_GROUP,
-                    sp.SLOPE_PERCENT,
-                    sp.AVAILABLE_WATER_CAPACITY,
-                    sp.NITROGEN_PPM,
-                    sp.PHOSPHORUS_PPM,
-                    sp.POTASSIUM_PPM,
-                    sp.TAXONOMIC_CLASS,
-                    sp.AGRICULTURAL_CAPABILITY,
-                    sp.SAMPLING_DEPTH_CM,
-                    sp.CONFIDENCE_SCORE,
-                    sp.MATCH_QUALITY,
-                    sp.DISTANCE_MILES,
-                    pp.ADDRESS,
-                    pp.CITY,
-                    pp.STATE_CODE,
-                    pp.ACRES,
-                    pp.COUNTY_ID
-                FROM SOIL_PROFILE sp
-                JOIN PARCEL_PROFILE pp ON sp.PARCEL_ID = pp.PARCEL_ID
-                WHERE sp.PARCEL_ID = %s
-                ORDER BY sp.COMPONENT_PERCENTAGE DESC
-                """
-                
-                cursor.execute(query, (property_id,))
-                results = cursor.fetchall()
-                
-                if results:
-                    columns = [desc[0] for desc in cursor.description]
-                    return [dict(zip(columns, row)) for row in results]
-                
-                return []
-                
+            return await self._query_all(_Q_SOIL, (property_id,))
         except Exception as e:
             logger.error(f"Error getting soil data: {str(e)}", exc_info=True)
             raise
-    
+
+    # Async job-id handoff for the soil query, the slowest multi-row lookup.
+    # Submission returns in tens of milliseconds; callers can poll the job
+    # and fetch rows when ready instead of holding a request open for the
+    # whole query duration.
+
+    async def submit_soil_query(self, property_id: str) -> str:
+        """Submit the soil query without waiting; returns the Snowflake query id"""
+        def work():
+            with self.get_connection() as conn:
+                cursor = self._cursor_for(conn)
+                cursor.execute_async(_Q_SOIL, (property_id,))
+                return cursor.sfqid
+
+        try:
+            return await asyncio.to_thread(work)
+        except Exception as e:
+            logger.error(f"Error submitting soil query: {str(e)}", exc_info=True)
+            raise
+
+    async def query_is_running(self, query_id: str) -> bool:
+        """Whether a previously submitted query is still executing"""
+        def work():
+            with self.get_connection() as conn:
+                return conn.is_still_running(conn.get_query_status(query_id))
+
+        try:
+            return await asyncio.to_thread(work)
+        except Exception as e:
+            logger.error(f"Error checking query status: {str(e)}", exc_info=True)
+            raise
+
+    async def fetch_soil_result(self, query_id: str) -> List[Dict[str, Any]]:
+        """Fetch the rows of a previously submitted soil query.
+
+        Blocks (off-thread) until the query completes, so poll
+        query_is_running() first when latency matters.
+        """
+        def work():
+            with self.get_connection() as conn:
+                cursor = self._cursor_for(conn)
+                cursor.get_results_from_sfqid(query_id)
+                return _rows_as_dicts(cursor)
+
+        try:
+            return await asyncio.to_thread(work)
+        except Exception as e:
+            logger.error(f"Error fetching soil query result: {str(e)}", exc_info=True)
+            raise
+
+    async def get_soil_summary(self, property_id: str) -> Optional[Dict[str, Any]]:
+        """Get an aggregated soil summary for a property.
+
+        Collapses SOIL_PROFILE to one JSON row in the warehouse (averages
+        plus the dominant component's attributes), for consumers that don't
+        need every component row.
+        """
+        try:
+            row = await self._query_one_cached("soil_summary", _Q_SOIL_SUMMARY, property_id)
+            if row is None:
+                return None
+            summary = row.get("SOIL_SUMMARY")
+            # VARIANT columns come back as JSON text in row mode
+            if isinstance(summary, str):
+                return orjson.loads(summary)
+            return summary
+        except Exception as e:
+            logger.error(f"Error getting soil summary: {str(e)}", exc_info=True)
+            raise
+
     async def search_properties_by_criteria(
         self,
         filters: Dict[str, Any],
         limit: int = 100
     ) -> List[Dict[str, Any]]:
         """Search properties by various criteria"""
+        # Absent filters bind as NULL, which the canonical query treats as
+        # "no constraint"
+        params = {
+            "min_acreage": filters.get("min_acreage"),
+            "max_acreage": filters.get("max_acreage"),
+            "county": filters.get("county"),
+            "state": filters.get("state"),
+            "limit": limit
+        }
+
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Build dynamic query based on filters
-                where_clauses = []
-                params = []
-                
-                if filters.get("min_acreage"):
-                    where_clauses.append("ACRES >= %s")
-                    params.append(filters["min_acreage"])
-                
-                if filters.get("max_acreage"):
-                    where_clauses.append("ACRES <= %s")
-                    params.append(filters["max_acreage"])
-                
-                if filters.get("county"):
-                    where_clauses.append("LOWER(COUNTY_ID) = LOWER(%s)")
-                    params.append(filters["county"])
-                
-                if filters.get("state"):
-                    where_clauses.append("LOWER(STATE_CODE) = LOWER(%s)")
-                    params.append(filters["state"])
-                
-                where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
-                
-                query = f"""
-                SELECT 
-                    PARCEL_ID,
-                    ADDRESS,
-                    CITY,
-                    STATE_CODE,
-                    COUNTY_ID,
-                    ZIP_CODE,
-                    ACRES,
-                    OWNER_NAME,
-                    TOTAL_VALUE,
-                    USECODE,
-                    USEDESC,
-                    LATITUDE,
-                    LONGITUDE
-                FROM PARCEL_PROFILE
-                WHERE {where_clause}
-                    AND ACRES IS NOT NULL
-                    AND LATITUDE IS NOT NULL
-                    AND LONGITUDE IS NOT NULL
-                LIMIT %s
-                """
-                
-                params.append(limit)
-                cursor.execute(query, params)
-                results = cursor.fetchall()
-                
-                if results:
-                    columns = [desc[0] for desc in cursor.description]
-                    return [dict(zip(columns, row)) for row in results]
-                
-                return []
-                
+            return await self._query_all(_Q_SEARCH, params)
         except Exception as e:
             logger.error(f"Error searching properties: {str(e)}", exc_info=True)
             raise
-    
+
     async def get_crop_history(self, property_id: str, years: int = 5) -> List[Dict[str, Any]]:
         """Get crop history for a property from CROP_HISTORY table"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Query for crop history using correct schema
-                query = """
-                SELECT 
-                    HISTORY_ID,
-                    PARCEL_ID,
-                    CROP_YEAR,
-                    CROP_TYPE,
-                    ROTATION_SEQUENCE,
-                    CROP_GEOJSON,
-                    COUNTY_ID,
-                    STATE_CODE,
-                    CREATED_AT,
-                    UPDATED_AT
-                FROM CROP_HISTORY
-                WHERE PARCEL_ID = %s
-                    AND CROP_YEAR >= YEAR(CURRENT_DATE) - %s
-                ORDER BY CROP_YEAR DESC, ROTATION_SEQUENCE ASC
-                """
-                
-                cursor.execute(query, (property_id, years))
-                results = cursor.fetchall()
-                
-                if results:
-                    columns = [desc[0] for desc in cursor.description]
-                    return [dict(zip(columns, row)) for row in results]
-                
-                return []
-                
+            return await self._query_all(_Q_CROP_HISTORY, (property_id, years))
         except Exception as e:
             logger.error(f"Error getting crop history: {str(e)}", exc_info=True)
             raise
-    
+
     async def get_comprehensive_analysis(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get comprehensive parcel analysis from COMPREHENSIVE_PARCEL_CDL_ANALYSIS table"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Query for comprehensive analysis
-                query = """
-                SELECT 
-                    PARCEL_ID,
-                    PARCEL_ACRES,
-                    COUNTY_ID,
-                    STATE_CODE,
-                    ADDRESS,
-                    OWNER_NAME,
-                    USECODE,
-                    USEDESC,
-                    ZONING,
-                    ZONING_DESCRIPTION,
-                    HOMESTEAD_EXEMPTION,
-                    TOTAL_VALUE,
-                    LAND_VALUE,
-                    IMPROVEMENT_VALUE,
-                    TAXAMT,
-                    SALEPRICE,
-                    SALEDATE,
-                    LAND_COVER_SUMMARY,
-                    DOMINANT_COVER_TYPE,
-                    DOMINANT_COVER_PERCENTAGE,
-                    TOTAL_COVER_TYPES,
-                    AGRICULTURAL_PERCENTAGE,
-                    FOREST_PERCENTAGE,
-                    DEVELOPED_PERCENTAGE,
-                    CROP_SUMMARY,
-                    DOMINANT_CROP,
-                    TOTAL_AGRICULTURAL_CROPS,
-                    AGRICULTURAL_CLASSIFICATION,
-                    SECTION_180_POTENTIAL,
-                    TAX_EXEMPTION_ANALYSIS,
-                    VALUATION_FLAG,
-                    INVESTMENT_OPPORTUNITY_FLAG
-                FROM COMPREHENSIVE_PARCEL_CDL_ANALYSIS
-                WHERE PARCEL_ID = %s
-                """
-                
-                cursor.execute(query, (property_id,))
-                result = cursor.fetchone()
-                
-                if result:
-                    columns = [desc[0] for desc in cursor.description]
-                    return dict(zip(columns, result))
-                
-                return None
-                
+            return await self._query_one_cached("comprehensive", _Q_COMPREHENSIVE, property_id)
         except Exception as e:
             logger.error(f"Error getting comprehensive analysis: {str(e)}", exc_info=True)
             raise
-    
+
+    async def get_comprehensive_analysis_bulk(
+        self, property_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get comprehensive analyses for many parcels in one query per 1000 ids.
+
+        Returns a dict keyed by PARCEL_ID; ids with no row are absent.
+        """
+        if not property_ids:
+            return {}
+        try:
+            return await self._query_bulk(_Q_COMPREHENSIVE_BULK, property_ids)
+        except Exception as e:
+            logger.error(f"Error getting comprehensive analyses in bulk: {str(e)}", exc_info=True)
+            raise
+
+    async def get_property_profile(self, property_id: str) -> Dict[str, Any]:
+        """Get the four single-row datasets for a parcel in one query.
+
+        Returns comprehensive_analysis, climate_data, section_180_estimates
+        and topography_data keyed by those names; datasets with no row are
+        absent. One round trip instead of four for the property detail path.
+        """
+        key = ("profile", property_id)
+        now = time.monotonic()
+        hit = _row_cache.get(key)
+        if hit is not None and now - hit[0] < _ROW_CACHE_TTL:
+            return hit[1]
+
+        try:
+            row = await self._query_one(_Q_PROFILE, (property_id,) * 4)
+            profile = row.get("PROFILE") if row else None
+            # VARIANT columns come back as JSON text in row mode
+            if isinstance(profile, str):
+                profile = orjson.loads(profile)
+            profile = profile or {}
+            if len(_row_cache) >= _ROW_CACHE_MAX:
+                _row_cache.clear()
+            _row_cache[key] = (now, profile)
+            return profile
+        except Exception as e:
+            logger.error(f"Error getting property profile: {str(e)}", exc_info=True)
+            raise
+
     async def get_climate_data(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get climate data for a property from CLIMATE_DATA table"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Query for climate data
-                query = """
-                SELECT 
-                    CLIMATE_ID,
-                    PARCEL_ID,
-                    COUNTY_ID,
-                    STATE_CODE,
-                    DATA_YEAR,
-                    ANNUAL_PRECIPITATION_INCHES,
-                    ANNUAL_PRECIPITATION_MM,
-                    ANNUAL_SNOWFALL_INCHES,
-                    GROWING_DEGREE_DAYS,
-                    AVG_TEMPERATURE_F,
-                    MAX_TEMPERATURE_F,
-                    MIN_TEMPERATURE_F,
-                    CLIMATE_CLASSIFICATION,
-                    WEATHER_STATION_NAME,
-                    STATION_DISTANCE_MILES,
-                    YEARS_OF_DATA,
-                    DATA_PERIOD,
-                    IS_MULTI_YEAR_AVERAGE
-                FROM CLIMATE_DATA
-                WHERE PARCEL_ID = %s
-                ORDER BY DATA_YEAR DESC
-                LIMIT 1
-                """
-                
-                cursor.execute(query, (property_id,))
-                result = cursor.fetchone()
-                
-                if result:
-                    columns = [desc[0] for desc in cursor.description]
-                    return dict(zip(columns, result))
-                
-                return None
-                
+            return await self._query_one_cached("climate", _Q_CLIMATE, property_id)
         except Exception as e:
             logger.error(f"Error getting climate data: {str(e)}", exc_info=True)
             raise
-    
+
     async def get_section_180_estimates(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get Section 180 tax deduction estimates for a property"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Query for Section 180 estimates
-                query = """
-                SELECT 
-                    ESTIMATE_ID,
-                    PARCEL_ID,
-                    ESTIMATE_DATE,
-                    TOTAL_DEDUCTION,
-                    NITROGEN_VALUE,
-                    PHOSPHORUS_VALUE,
-                    POTASSIUM_VALUE,
-                    CONFIDENCE_SCORE,
-                    METHODOLOGY,
-                    NOTES
-                FROM SECTION_180_ESTIMATES
-                WHERE PARCEL_ID = %s
-                ORDER BY ESTIMATE_DATE DESC
-                LIMIT 1
-                """
-                
-                cursor.execute(query, (property_id,))
-                result = cursor.fetchone()
-                
-                if result:
-                    columns = [desc[0] for desc in cursor.description]
-                    return dict(zip(columns, result))
-                
-                return None
-                
+            return await self._query_one_cached("section_180", _Q_SECTION_180, property_id)
         except Exception as e:
             logger.error(f"Error getting Section 180 estimates: {str(e)}", exc_info=True)
             raise
-    
+
     async def get_topography_data(self, property_id: str) -> Optional[Dict[str, Any]]:
         """Get topography data for a property"""
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor()
-                
-                # Query for topography data
-                query = """
-                SELECT 
-                    TOPO_ID,
-                    PARCEL_ID,
-                    MEAN_ELEVATION_FT,
-                    MIN_ELEVATION_FT,
-                    MAX_ELEVATION_FT,
-                    ELEVATION_VARIANCE_FT,
-                    SLOPE_PERCENT,
-                    TERRAIN_ANALYSIS,
-                    RESOLUTION,
-                    COLLECTION_METHOD,
-                    COLLECTION_DATE
-                FROM TOPOGRAPHY
-                WHERE PARCEL_ID = %s
-                ORDER BY COLLECTION_DATE DESC
-                LIMIT 1
-                """
-                
-                cursor.execute(query, (property_id,))
-                result = cursor.fetchone()
-                
-                if result:
-                    columns = [desc[0] for desc in cursor.description]
-                    return dict(zip(columns, result))
-                
-                return None
-                
+            return await self._query_one_cached("topography", _Q_TOPOGRAPHY, property_id)
         except Exception as e:
             logger.error(f"Error getting topography data: {str(e)}", exc_info=True)
             raise
@@ -2,11 +2,13 @@
 Crop Recommendation Service
 Provides intelligent crop recommendations based on historical data, soil conditions, and market trends
 """
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
-import json
 from dataclasses import dataclass
+from operator import attrgetter
+import orjson
 
 from data_connectors.snowflake_connector import SnowflakeConnector
 from services.llm_service import LLMService
@@ -44,6 +46,19 @@ class CropRecommendation:
     market_outlook: str
 
 
+# System prompt for AI-enhanced analysis. The user message is compact JSON
+# holding the top recommendations, so instructions live here once instead of
+# being rebuilt per request
+_AI_ANALYSIS_SYSTEM_PROMPT = (
+    "You are an agricultural advisor. The user message is JSON with a parcel "
+    "ID and its top crop recommendations. Provide a comprehensive but concise "
+    "analysis to help a farmer decide: 1) a summary of the top recommendation "
+    "and why it is the best choice, 2) key factors that influenced the "
+    "recommendations, 3) potential risks and mitigation strategies, 4) "
+    "long-term rotation strategy suggestions, 5) market timing considerations."
+)
+
+
 class CropRecommendationService:
     """Service for generating intelligent crop recommendations"""
     
@@ -82,20 +97,22 @@ class CropRecommendationService:
     async def get_crop_history_for_parcel(self, parcel_id: str, years: int = 5) -> List[CropHistoryData]:
         """Get crop history for a specific parcel"""
         try:
+            # CROP_GEOJSON is deliberately not selected: it is the widest
+            # column (a full field geometry per record) and no consumer of
+            # this service reads it
             query = """
-            SELECT 
+            SELECT
                 HISTORY_ID,
                 PARCEL_ID,
                 CROP_YEAR,
                 CROP_TYPE,
                 ROTATION_SEQUENCE,
-                CROP_GEOJSON,
                 COUNTY_ID,
                 STATE_CODE,
                 CREATED_AT,
                 UPDATED_AT
-            FROM CROP_HISTORY 
-            WHERE PARCEL_ID = %s 
+            FROM CROP_HISTORY
+            WHERE PARCEL_ID = %s
             AND CROP_YEAR >= %s
             ORDER BY CROP_YEAR DESC, ROTATION_SEQUENCE ASC
             """
@@ -113,11 +130,11 @@ class CropRecommendationService:
                     crop_year=row[2],
                     crop_type=row[3],
                     rotation_sequence=row[4],
-                    crop_geojson=json.loads(row[5]) if row[5] else {},
-                    county_id=row[6],
-                    state_code=row[7],
-                    created_at=row[8],
-                    updated_at=row[9]
+                    crop_geojson={},
+                    county_id=row[5],
+                    state_code=row[6],
+                    created_at=row[7],
+                    updated_at=row[8]
                 ))
             
             return crop_history
@@ -289,38 +306,41 @@ class CropRecommendationService:
     ) -> List[CropRecommendation]:
         """Generate comprehensive crop recommendations for a parcel"""
         try:
-            # Get crop history
-            crop_history = await self.get_crop_history_for_parcel(parcel_id)
-            
-            # If we have history, extract location info
-            if crop_history and not (county_id and state_code):
-                county_id = crop_history[0].county_id
-                state_code = crop_history[0].state_code
-            
-            # Get regional performance data
-            regional_data = {}
             if county_id and state_code:
-                regional_data = await self.get_regional_crop_performance(county_id, state_code)
-            
+                # Location is known up front, so the two Snowflake queries are
+                # independent - overlap them instead of paying both latencies
+                crop_history, regional_data = await asyncio.gather(
+                    self.get_crop_history_for_parcel(parcel_id),
+                    self.get_regional_crop_performance(county_id, state_code),
+                )
+            else:
+                # Location must come from the history, so the calls stay ordered
+                crop_history = await self.get_crop_history_for_parcel(parcel_id)
+                regional_data = {}
+                if crop_history:
+                    county_id = crop_history[0].county_id
+                    state_code = crop_history[0].state_code
+                if county_id and state_code:
+                    regional_data = await self.get_regional_crop_performance(county_id, state_code)
+
             # Analyze rotation patterns
             rotation_analysis = self.analyze_rotation_patterns(crop_history)
-            
-            # Generate recommendations for each major crop type
-            recommendations = []
+
+            # Generate recommendations for each major crop type concurrently
             crop_types = ["corn", "soybeans", "wheat", "cotton"]
-            
-            for crop_type in crop_types:
-                recommendation = await self._generate_single_crop_recommendation(
+            results = await asyncio.gather(*(
+                self._generate_single_crop_recommendation(
                     crop_type, parcel_id, crop_history, regional_data, rotation_analysis
                 )
-                if recommendation:
-                    recommendations.append(recommendation)
-            
+                for crop_type in crop_types
+            ))
+            recommendations = [rec for rec in results if rec]
+
             # Sort by suitability score
             recommendations.sort(key=lambda x: x.suitability_score, reverse=True)
-            
+
             return recommendations
-            
+
         except Exception as e:
             logger.error(f"Error generating crop recommendations: {str(e)}")
             return []
@@ -599,45 +619,36 @@ class CropRecommendationService:
     ) -> Dict[str, Any]:
         """Get AI-enhanced recommendations with detailed analysis"""
         try:
-            # Prepare context for LLM
-            context = f"""
-            Parcel ID: {parcel_id}
-            
-            Crop Recommendations Analysis:
-            """
-            
-            for i, rec in enumerate(recommendations[:3], 1):  # Top 3 recommendations
-                context += f"""
-                
-                {i}. {rec.crop_type}
-                   - Suitability Score: {rec.suitability_score}/100
-                   - Expected Yield: {rec.expected_yield}
-                   - Revenue Potential: {rec.revenue_potential}
-                   - Market Outlook: {rec.market_outlook}
-                   - Confidence: {rec.confidence_level}
-                   - Considerations: {', '.join(rec.considerations[:3])}
-                """
-            
+            # One call covering the top recommendations by score; prompt is
+            # compact JSON so token cost stays flat regardless of how many
+            # recommendations the caller passes in
+            top_recs = sorted(
+                recommendations, key=attrgetter("suitability_score"), reverse=True
+            )[:3]
+            doc: Dict[str, Any] = {
+                "parcel_id": parcel_id,
+                "recommendations": [
+                    {
+                        "crop_type": rec.crop_type,
+                        "suitability_score": rec.suitability_score,
+                        "expected_yield": rec.expected_yield,
+                        "revenue_potential": rec.revenue_potential,
+                        "market_outlook": rec.market_outlook,
+                        "confidence_level": rec.confidence_level,
+                        "considerations": rec.considerations[:3]
+                    }
+                    for rec in top_recs
+                ]
+            }
             if additional_context:
-                context += f"\n\nAdditional Context: {additional_context}"
-            
-            # Generate AI analysis
-            prompt = f"""
-            Based on the crop recommendation data provided, please provide:
-            
-            1. A summary of the top recommendation and why it's the best choice
-            2. Key factors that influenced the recommendations
-            3. Potential risks and mitigation strategies
-            4. Long-term rotation strategy suggestions
-            5. Market timing considerations
-            
-            Context:
-            {context}
-            
-            Please provide a comprehensive but concise analysis that would help a farmer make informed decisions.
-            """
-            
-            ai_analysis = await self.llm_service.generate_response(prompt)
+                doc["additional_context"] = additional_context
+
+            ai_analysis, _ = await self.llm_service.generate_response(
+                conversation_history=[
+                    {"role": "user", "content": orjson.dumps(doc).decode()}
+                ],
+                system_prompt=_AI_ANALYSIS_SYSTEM_PROMPT
+            )
             
             return {
                 "ai_analysis": ai_analysis,
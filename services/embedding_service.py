@@ -1,6 +1,8 @@
 """
 Embedding Service for semantic search and similarity
 """
+import base64
+import hashlib
 import openai
 import numpy as np
 from typing import List, Dict, Any, Optional
@@ -8,6 +10,7 @@ import logging
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from api.core.config import settings
+from api.core.dependencies import cache
 
 logger = logging.getLogger(__name__)
 
@@ -18,21 +21,43 @@ class EmbeddingService:
         self.model = settings.EMBEDDING_MODEL
         self.dimension = settings.EMBEDDING_DIMENSION
     
+    def _embedding_cache_key(self, text: str) -> str:
+        """Cache key for one text, scoped to the configured model"""
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        return f"emb:v1:{self.model}:{digest}"
+
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=4, max=10)
     )
     async def create_embedding(self, text: str) -> List[float]:
-        """Create embedding for a single text"""
+        """Create embedding for a single text
+
+        Identical texts (repeat search queries, re-indexed properties) are
+        served from Redis instead of re-embedding. Vectors are stored as
+        base64-packed float32 - ~4 bytes per dimension versus ~25 characters
+        as JSON floats.
+        """
+        key = self._embedding_cache_key(text)
+        cached = await cache.get(key)
+        if cached:
+            return np.frombuffer(base64.b64decode(cached), dtype=np.float32).tolist()
+
         try:
             response = self.client.embeddings.create(
                 model=self.model,
                 input=text
             )
-            return response.data[0].embedding
+            embedding = response.data[0].embedding
         except Exception as e:
             logger.error(f"Error creating embedding: {str(e)}", exc_info=True)
             raise
+
+        packed = base64.b64encode(
+            np.asarray(embedding, dtype=np.float32).tobytes()
+        ).decode()
+        await cache.set(key, packed, ttl=86400)  # 24h
+        return embedding
     
     async def create_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Create embeddings for multiple texts"""
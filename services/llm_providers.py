@@ -2,7 +2,7 @@
 Multi-provider LLM service supporting OpenAI, Anthropic, Google, Azure, and Ollama
 """
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import logging
 import json
 from decimal import Decimal
@@ -27,7 +27,20 @@ class BaseLLMProvider(ABC):
     ) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
         """Generate response from the LLM"""
         pass
-    
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """Stream response tokens as they are generated.
+
+        Providers without native streaming fall back to a single chunk
+        containing the full response.
+        """
+        content, _ = await self.generate_response(messages)
+        if content:
+            yield content
+
     def _json_serializer(self, obj):
         """JSON serializer for objects not serializable by default json code"""
         if isinstance(obj, Decimal):
@@ -41,13 +54,15 @@ class OpenAIProvider(BaseLLMProvider):
     def __init__(self):
         super().__init__()
         try:
-            from openai import OpenAI
+            from openai import AsyncOpenAI
             # Only set base_url if it's not empty/None/whitespace
             client_kwargs = {"api_key": settings.OPENAI_API_KEY}
             if settings.OPENAI_BASE_URL and settings.OPENAI_BASE_URL.strip():
                 client_kwargs["base_url"] = settings.OPENAI_BASE_URL.strip()
-            
-            self.client = OpenAI(**client_kwargs)
+
+            # Async client - the sync one blocks the event loop for the full
+            # API round trip, serializing every concurrent request
+            self.client = AsyncOpenAI(**client_kwargs)
             self.model = settings.LLM_MODEL or settings.OPENAI_MODEL
         except ImportError:
             raise ImportError("OpenAI package not installed. Run: pip install openai")
@@ -69,13 +84,13 @@ class OpenAIProvider(BaseLLMProvider):
             if tools:
                 kwargs["tools"] = tools
                 kwargs["tool_choice"] = "auto"
-            
-            response = self.client.chat.completions.create(**kwargs)
-            
+
+            response = await self.client.chat.completions.create(**kwargs)
+
             message = response.choices[0].message
             content = message.content
             tool_calls = None
-            
+
             if hasattr(message, 'tool_calls') and message.tool_calls:
                 tool_calls = []
                 for tool_call in message.tool_calls:
@@ -86,9 +101,32 @@ class OpenAIProvider(BaseLLMProvider):
                             "arguments": tool_call.function.arguments
                         }
                     })
-            
+
             return content, tool_calls
-            
+
+        except Exception as e:
+            logger.error(f"OpenAI API error: {str(e)}")
+            raise
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """Stream response tokens using OpenAI"""
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                stream=True
+            )
+
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+
         except Exception as e:
             logger.error(f"OpenAI API error: {str(e)}")
             raise
@@ -101,7 +139,9 @@ class AnthropicProvider(BaseLLMProvider):
         super().__init__()
         try:
             import anthropic
-            self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+            # Async client - the sync one blocks the event loop for the full
+            # generation, which is worst during streaming
+            self.client = anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
             # Use Anthropic-specific model, not the generic LLM_MODEL
             self.model = settings.ANTHROPIC_MODEL
         except ImportError:
@@ -138,10 +178,16 @@ class AnthropicProvider(BaseLLMProvider):
                 "messages": claude_messages
             }
             
-            # Combine all system messages
+            # Combine all system messages into one block marked cacheable, so
+            # Anthropic reuses the prefill KV cache for the stable prefix
+            # (system prompt + context) across turns of a conversation
             if system_messages:
-                kwargs["system"] = "\n\n".join(system_messages)
-            
+                kwargs["system"] = [{
+                    "type": "text",
+                    "text": "\n\n".join(system_messages),
+                    "cache_control": {"type": "ephemeral"}
+                }]
+
             if tools:
                 # Convert OpenAI tools format to Anthropic format
                 claude_tools = []
@@ -154,7 +200,7 @@ class AnthropicProvider(BaseLLMProvider):
                         })
                 kwargs["tools"] = claude_tools
             
-            response = self.client.messages.create(**kwargs)
+            response = await self.client.messages.create(**kwargs)
             
             content = ""
             tool_calls = None
@@ -174,7 +220,50 @@ class AnthropicProvider(BaseLLMProvider):
                     })
             
             return content, tool_calls
-            
+
+        except Exception as e:
+            logger.error(f"Anthropic API error: {str(e)}")
+            raise
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """Stream response tokens using Anthropic Claude"""
+        try:
+            system_messages = []
+            claude_messages = []
+
+            for msg in messages:
+                if msg["role"] == "system":
+                    system_messages.append(msg["content"])
+                else:
+                    claude_messages.append(msg)
+
+            if not claude_messages:
+                claude_messages.append({
+                    "role": "user",
+                    "content": "Hello, please help me with agricultural and land management questions."
+                })
+
+            kwargs = {
+                "model": self.model,
+                "max_tokens": self.max_tokens,
+                "temperature": self.temperature,
+                "messages": claude_messages
+            }
+
+            if system_messages:
+                kwargs["system"] = [{
+                    "type": "text",
+                    "text": "\n\n".join(system_messages),
+                    "cache_control": {"type": "ephemeral"}
+                }]
+
+            async with self.client.messages.stream(**kwargs) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
         except Exception as e:
             logger.error(f"Anthropic API error: {str(e)}")
             raise
@@ -237,8 +326,8 @@ class AzureOpenAIProvider(BaseLLMProvider):
     def __init__(self):
         super().__init__()
         try:
-            from openai import AzureOpenAI
-            self.client = AzureOpenAI(
+            from openai import AsyncAzureOpenAI
+            self.client = AsyncAzureOpenAI(
                 api_key=settings.AZURE_OPENAI_API_KEY,
                 azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
                 api_version=settings.AZURE_OPENAI_API_VERSION
@@ -264,9 +353,9 @@ class AzureOpenAIProvider(BaseLLMProvider):
             if tools:
                 kwargs["tools"] = tools
                 kwargs["tool_choice"] = "auto"
-            
-            response = self.client.chat.completions.create(**kwargs)
-            
+
+            response = await self.client.chat.completions.create(**kwargs)
+
             message = response.choices[0].message
             content = message.content
             tool_calls = None
@@ -283,7 +372,30 @@ class AzureOpenAIProvider(BaseLLMProvider):
                     })
             
             return content, tool_calls
-            
+
+        except Exception as e:
+            logger.error(f"Azure OpenAI API error: {str(e)}")
+            raise
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """Stream response tokens using Azure OpenAI"""
+        try:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                stream=True
+            )
+
+            async for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    yield delta
+
         except Exception as e:
             logger.error(f"Azure OpenAI API error: {str(e)}")
             raise
@@ -295,12 +407,14 @@ class OllamaProvider(BaseLLMProvider):
     def __init__(self):
         super().__init__()
         try:
-            import requests
+            import httpx
             self.base_url = settings.OLLAMA_BASE_URL
             self.model = settings.LLM_MODEL or settings.OLLAMA_MODEL
-            self.session = requests.Session()
+            # Async client - a sync HTTP call would hold the event loop for
+            # the whole (local, often slow) generation
+            self.client = httpx.AsyncClient(timeout=60)
         except ImportError:
-            raise ImportError("Requests package not installed. Run: pip install requests")
+            raise ImportError("httpx package not installed. Run: pip install httpx")
     
     async def generate_response(
         self,
@@ -327,13 +441,12 @@ class OllamaProvider(BaseLLMProvider):
                 }
             }
             
-            response = self.session.post(
+            response = await self.client.post(
                 f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=60
+                json=payload
             )
             response.raise_for_status()
-            
+
             result = response.json()
             content = result.get("response", "")
             
@@ -341,7 +454,51 @@ class OllamaProvider(BaseLLMProvider):
             tool_calls = None
             
             return content, tool_calls
-            
+
+        except Exception as e:
+            logger.error(f"Ollama API error: {str(e)}")
+            raise
+
+    async def stream_response(
+        self,
+        messages: List[Dict[str, str]]
+    ) -> AsyncIterator[str]:
+        """Stream response tokens using Ollama"""
+        try:
+            prompt = ""
+            for msg in messages:
+                role = msg["role"].title()
+                prompt += f"{role}: {msg['content']}\n\n"
+
+            prompt += "Assistant: "
+
+            payload = {
+                "model": self.model,
+                "prompt": prompt,
+                "stream": True,
+                "options": {
+                    "temperature": self.temperature,
+                    "num_predict": self.max_tokens
+                }
+            }
+
+            async with self.client.stream(
+                "POST",
+                f"{self.base_url}/api/generate",
+                json=payload
+            ) as response:
+                response.raise_for_status()
+
+                async for line in response.aiter_lines():
+                    if not line:
+                        continue
+                    data = json.loads(line)
+                    token = data.get("response")
+                    if token:
+                        yield token
+                    if data.get("done"):
+                        break
+
         except Exception as e:
             logger.error(f"Ollama API error: {str(e)}")
             raise
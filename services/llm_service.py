@@ -1,9 +1,10 @@
 """
 LLM Service for generating AI responses with multi-provider support
 """
-from typing import List, Dict, Any, Optional, Tuple
+from typing import AsyncIterator, List, Dict, Any, Optional, Tuple
 import logging
 import json
+import orjson
 from decimal import Decimal
 from tenacity import retry, stop_after_attempt, wait_exponential
 
@@ -119,20 +120,51 @@ class LLMService:
             logger.error(f"Error generating LLM response: {str(e)}", exc_info=True)
             return "I apologize, but I encountered an error processing your request. Please try again.", None
     
+    async def stream_response(
+        self,
+        conversation_history: List[Dict[str, str]],
+        system_prompt: str,
+        property_context: Optional[Dict[str, Any]] = None,
+        user_preferences: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """Stream AI response tokens as they arrive from the provider.
+
+        Tool calling is not supported on the streaming path; clients that
+        need tools should use generate_response.
+        """
+        messages = [{"role": "system", "content": system_prompt}]
+
+        if property_context or user_preferences:
+            context_message = self._build_context_message(property_context, user_preferences)
+            messages.append({"role": "system", "content": context_message})
+
+        messages.extend(self._manage_context_length(conversation_history))
+
+        async for token in self.provider.stream_response(messages):
+            yield token
+
     def _build_context_message(
         self,
         property_context: Optional[Dict[str, Any]],
         user_preferences: Optional[Dict[str, Any]]
     ) -> str:
-        """Build context message for the LLM"""
+        """Build context message for the LLM.
+
+        Keys are sorted so the rendered block is byte-identical across turns
+        of the same conversation - a stable prefix is what lets providers
+        reuse their KV/prompt cache instead of re-prefilling every turn.
+        """
         context_parts = []
-        
+        opts = orjson.OPT_SORT_KEYS | orjson.OPT_INDENT_2
+
         if property_context:
-            context_parts.append(f"Property Context: {json.dumps(property_context, indent=2)}")
-        
+            rendered = orjson.dumps(property_context, option=opts, default=self._json_serializer).decode()
+            context_parts.append(f"Property Context: {rendered}")
+
         if user_preferences:
-            context_parts.append(f"User Preferences: {json.dumps(user_preferences, indent=2)}")
-        
+            rendered = orjson.dumps(user_preferences, option=opts, default=self._json_serializer).decode()
+            context_parts.append(f"User Preferences: {rendered}")
+
         return "\n\n".join(context_parts)
     
     def _get_available_tools(self) -> List[Dict[str, Any]]:
@@ -0,0 +1,192 @@
+"""
+Semantic cache for LLM chat responses
+
+Caches (response, sources) pairs in Redis keyed two ways: an exact key hashed
+from the conversation type, property and normalized message, and a RediSearch
+HNSW vector index over the message embedding so near-duplicate questions can
+reuse an answer without another LLM call.
+"""
+import hashlib
+import logging
+import time
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import orjson
+
+from api.core.config import settings
+from api.core.dependencies import redis_client
+
+logger = logging.getLogger(__name__)
+
+
+def _json_default(obj):
+    """Handle the Decimals Snowflake-sourced payloads carry"""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+class SemanticCache:
+    """Redis-backed exact + approximate cache for chat responses"""
+
+    INDEX_NAME = "idx:chat_semantic_cache"
+    KEY_PREFIX = "chat_cache:"
+    TTL_SECONDS = 86400
+    # Cosine distance below which a KNN neighbour counts as "the same question"
+    SCORE_THRESHOLD = 0.12
+    # Consecutive Redis failures before the cache disables itself, and how
+    # long it stays disabled before the next request may retry (half-open);
+    # a success closes the breaker, another failure re-arms the cooldown
+    MAX_FAILURES = 3
+    RESET_SECONDS = 60.0
+
+    def __init__(self, redis=redis_client):
+        self.redis = redis
+        self.dimension = settings.EMBEDDING_DIMENSION
+        self._index_ready = False
+        self._failures = 0
+        self._disabled_until = 0.0
+
+    @property
+    def enabled(self) -> bool:
+        if self.redis is None:
+            return False
+        if self._failures < self.MAX_FAILURES:
+            return True
+        return time.monotonic() >= self._disabled_until
+
+    @staticmethod
+    def exact_key(conversation_type: str, property_id: Optional[str], message: str) -> str:
+        normalized = " ".join(message.lower().split())
+        digest = hashlib.sha256(
+            f"{conversation_type}|{property_id or ''}|{normalized}".encode()
+        ).hexdigest()
+        return f"{SemanticCache.KEY_PREFIX}{digest}"
+
+    @staticmethod
+    def _escape_tag(value: str) -> str:
+        """Escape RediSearch TAG query syntax (dialect-2 operators).
+
+        Parcel ids contain hyphens and other punctuation that would
+        otherwise parse as operators and error out or match wrongly.
+        """
+        return "".join(c if c.isalnum() else "\\" + c for c in value)
+
+    def _record_failure(self, error: Exception) -> None:
+        self._failures += 1
+        if self._failures >= self.MAX_FAILURES:
+            self._disabled_until = time.monotonic() + self.RESET_SECONDS
+            logger.warning(
+                f"Semantic cache disabled for {self.RESET_SECONDS:.0f}s "
+                f"after repeated Redis errors: {error}"
+            )
+
+    async def _ensure_index(self) -> None:
+        """Create the HNSW vector index once (idempotent)"""
+        if self._index_ready:
+            return
+        try:
+            await self.redis.execute_command(
+                "FT.CREATE", self.INDEX_NAME,
+                "ON", "HASH",
+                "PREFIX", "1", self.KEY_PREFIX,
+                "SCHEMA",
+                "conversation_type", "TAG",
+                "property_id", "TAG",
+                "payload", "TEXT", "NOINDEX",
+                "embedding", "VECTOR", "HNSW", "6",
+                "TYPE", "FLOAT32",
+                "DIM", str(self.dimension),
+                "DISTANCE_METRIC", "COSINE",
+            )
+        except Exception as e:
+            if "Index already exists" not in str(e):
+                raise
+        self._index_ready = True
+
+    async def lookup_exact(
+        self,
+        conversation_type: str,
+        property_id: Optional[str],
+        message: str
+    ) -> Optional[Dict[str, Any]]:
+        """Return a cached response for the exact same question, if any"""
+        if not self.enabled:
+            return None
+        try:
+            key = self.exact_key(conversation_type, property_id, message)
+            payload = await self.redis.hget(key, "payload")
+            if payload:
+                self._failures = 0
+                return orjson.loads(payload)
+            return None
+        except Exception as e:
+            self._record_failure(e)
+            return None
+
+    async def lookup_similar(
+        self,
+        conversation_type: str,
+        property_id: Optional[str],
+        embedding: List[float]
+    ) -> Optional[Dict[str, Any]]:
+        """Return a cached response for a semantically equivalent question"""
+        if not self.enabled:
+            return None
+        try:
+            await self._ensure_index()
+            query = (
+                f"(@conversation_type:{{{self._escape_tag(conversation_type)}}} "
+                f"@property_id:{{{self._escape_tag(property_id or 'none')}}})"
+                "=>[KNN 1 @embedding $vec AS score]"
+            )
+            result = await self.redis.execute_command(
+                "FT.SEARCH", self.INDEX_NAME, query,
+                "PARAMS", "2", "vec", np.asarray(embedding, dtype=np.float32).tobytes(),
+                "RETURN", "2", "score", "payload",
+                "DIALECT", "2",
+            )
+            if not result or result[0] == 0:
+                return None
+            # Result shape: [count, key, [field, value, field, value, ...]]
+            fields = dict(zip(result[2][::2], result[2][1::2]))
+            if float(fields.get("score", 1.0)) > self.SCORE_THRESHOLD:
+                return None
+            self._failures = 0
+            return orjson.loads(fields["payload"])
+        except Exception as e:
+            self._record_failure(e)
+            return None
+
+    async def store(
+        self,
+        conversation_type: str,
+        property_id: Optional[str],
+        message: str,
+        embedding: Optional[List[float]],
+        response: Dict[str, Any]
+    ) -> None:
+        """Cache a generated response under both the exact and vector keys"""
+        if not self.enabled:
+            return
+        try:
+            await self._ensure_index()
+            key = self.exact_key(conversation_type, property_id, message)
+            mapping = {
+                "conversation_type": conversation_type,
+                "property_id": property_id or "none",
+                "payload": orjson.dumps(response, default=_json_default),
+            }
+            if embedding is not None:
+                mapping["embedding"] = np.asarray(embedding, dtype=np.float32).tobytes()
+            await self.redis.hset(key, mapping=mapping)
+            await self.redis.expire(key, self.TTL_SECONDS)
+            self._failures = 0
+        except Exception as e:
+            self._record_failure(e)
+
+
+# Shared instance used by the chat endpoint
+semantic_cache = SemanticCache()